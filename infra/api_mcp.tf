@@ -50,13 +50,31 @@ resource "aws_apigatewayv2_integration" "mcp_server" {
   payload_format_version = "2.0"
 }
 
+# Validates x-api-key before the MCP server Lambda is invoked; results are
+# cached per key so repeat requests skip the DynamoDB lookup.
+# - A revoked or expired key keeps working until its cached result expires,
+#   i.e. for up to authorizer_result_ttl_in_seconds after revocation.
+# - Requests without the header are rejected by API Gateway itself with
+#   401 {"message": "Unauthorized"} rather than the server's JSON-RPC error.
+resource "aws_apigatewayv2_authorizer" "mcp_api_key" {
+  api_id                            = aws_apigatewayv2_api.main.id
+  authorizer_type                   = "REQUEST"
+  authorizer_uri                    = aws_lambda_function.mcp_authorizer.invoke_arn
+  identity_sources                  = ["$request.header.x-api-key"]
+  name                              = "mcp-api-key-authorizer"
+  authorizer_payload_format_version = "2.0"
+  enable_simple_responses           = true
+  authorizer_result_ttl_in_seconds  = 300
+}
+
 # POST /mcp/messages - MCP protocol messages
 resource "aws_apigatewayv2_route" "mcp_messages" {
   api_id    = aws_apigatewayv2_api.main.id
   route_key = "POST /mcp/messages"
   target    = "integrations/${aws_apigatewayv2_integration.mcp_server.id}"
 
-  authorization_type = "NONE"  # API key auth handled in Lambda
+  authorization_type = "CUSTOM"
+  authorizer_id      = aws_apigatewayv2_authorizer.mcp_api_key.id
 }
 
 # GET /mcp/initialize - MCP initialization endpoint
@@ -65,7 +83,8 @@ resource "aws_apigatewayv2_route" "mcp_initialize" {
   route_key = "GET /mcp/initialize"
   target    = "integrations/${aws_apigatewayv2_integration.mcp_server.id}"
 
-  authorization_type = "NONE"  # API key auth handled in Lambda
+  authorization_type = "CUSTOM"
+  authorizer_id      = aws_apigatewayv2_authorizer.mcp_api_key.id
 }
 
 # POST /mcp/initialize - MCP initialization endpoint (POST variant)
@@ -74,7 +93,8 @@ resource "aws_apigatewayv2_route" "mcp_initialize_post" {
   route_key = "POST /mcp/initialize"
   target    = "integrations/${aws_apigatewayv2_integration.mcp_server.id}"
 
-  authorization_type = "NONE"  # API key auth handled in Lambda
+  authorization_type = "CUSTOM"
+  authorizer_id      = aws_apigatewayv2_authorizer.mcp_api_key.id
 }
 
 # POST /mcp/register - MCP client registration endpoint
@@ -83,7 +103,8 @@ resource "aws_apigatewayv2_route" "mcp_register" {
   route_key = "POST /mcp/register"
   target    = "integrations/${aws_apigatewayv2_integration.mcp_server.id}"
 
-  authorization_type = "NONE"  # API key auth handled in Lambda
+  authorization_type = "CUSTOM"
+  authorizer_id      = aws_apigatewayv2_authorizer.mcp_api_key.id
 }
 
 # GET /mcp/register - MCP client registration endpoint (GET variant)
@@ -92,7 +113,8 @@ resource "aws_apigatewayv2_route" "mcp_register_get" {
   route_key = "GET /mcp/register"
   target    = "integrations/${aws_apigatewayv2_integration.mcp_server.id}"
 
-  authorization_type = "NONE"  # API key auth handled in Lambda
+  authorization_type = "CUSTOM"
+  authorizer_id      = aws_apigatewayv2_authorizer.mcp_api_key.id
 }
 
 # GET /mcp/sse - SSE connection endpoint
@@ -101,7 +123,8 @@ resource "aws_apigatewayv2_route" "mcp_sse" {
   route_key = "GET /mcp/sse"
   target    = "integrations/${aws_apigatewayv2_integration.mcp_server.id}"
 
-  authorization_type = "NONE"  # API key auth handled in Lambda
+  authorization_type = "CUSTOM"
+  authorizer_id      = aws_apigatewayv2_authorizer.mcp_api_key.id
 }
 
 output "mcp_api_endpoint" {
@@ -99,10 +99,92 @@ resource "aws_lambda_permission" "mcp_server_api" {
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
 }
 
+# IAM role for MCP API key authorizer Lambda
+resource "aws_iam_role" "mcp_authorizer" {
+  name = "${local.name_prefix}-mcp-authorizer"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = "sts:AssumeRole"
+        Effect = "Allow"
+        Principal = {
+          Service = "lambda.amazonaws.com"
+        }
+      }
+    ]
+  })
+
+  tags = local.common_tags
+}
+
+resource "aws_iam_role_policy" "mcp_authorizer" {
+  name = "mcp-authorizer-policy"
+  role = aws_iam_role.mcp_authorizer.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "logs:CreateLogGroup",
+          "logs:CreateLogStream",
+          "logs:PutLogEvents"
+        ]
+        Resource = "arn:aws:logs:*:*:*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:UpdateItem"
+        ]
+        Resource = aws_dynamodb_table.mcp_keys.arn
+      }
+    ]
+  })
+}
+
+# Lambda authorizer validating MCP API keys before the MCP server runs
+resource "aws_lambda_function" "mcp_authorizer" {
+  filename         = "${path.module}/../dist/mcp_authorizer.zip"
+  function_name    = "${local.name_prefix}-mcp-authorizer"
+  role             = aws_iam_role.mcp_authorizer.arn
+  handler          = "authorizer.lambda_handler"
+  source_code_hash = fileexists("${path.module}/../dist/mcp_authorizer.zip") ? filebase64sha256("${path.module}/../dist/mcp_authorizer.zip") : ""
+  runtime          = "python3.11"
+  timeout          = 10
+
+  environment {
+    variables = {
+      MCP_KEYS_TABLE = aws_dynamodb_table.mcp_keys.name
+    }
+  }
+
+  tags = local.common_tags
+}
+
+resource "aws_cloudwatch_log_group" "mcp_authorizer" {
+  name              = "/aws/lambda/${aws_lambda_function.mcp_authorizer.function_name}"
+  retention_in_days = 7
+
+  tags = local.common_tags
+}
+
+resource "aws_lambda_permission" "mcp_authorizer_api" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.mcp_authorizer.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"
+}
+
 # Lambda URL for direct invocation (alternative to API Gateway)
 resource "aws_lambda_function_url" "mcp_server" {
   function_name      = aws_lambda_function.mcp_server.function_name
-  authorization_type = "NONE"  # API key auth is handled in the function
+  authorization_type = "NONE"  # No API Gateway here, so API key auth is handled in the function
 
   cors {
     allow_credentials = false
@@ -3,11 +3,20 @@ AWS client utilities for assuming roles and creating regional clients.
 """
 import boto3
 from typing import Dict, Any, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# Shared by every long-lived client: adaptive retries back off client-side
+# on throttling, and a larger keep-alive pool serves concurrent writers.
+CLIENT_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+)
+
 
 def assume_role(role_arn: str, session_name: str = "GoldenGuardScan") -> Optional[Dict[str, str]]:
     """
@@ -5,6 +5,7 @@ from typing import Dict, Any, List, Tuple, Optional
 from .config_models import ResourceGroup, BaseConfig, Conflict
 from .models import Resource
 import copy
+import functools
 
 
 def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
@@ -53,6 +54,12 @@ def get_all_paths(config: Dict[str, Any], prefix: str = "") -> List[str]:
     return paths
 
 
+@functools.lru_cache(maxsize=1024)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """Split a dot-notation path into its keys, memoized per path string."""
+    return tuple(path.split('.'))
+
+
 def get_value_at_path(config: Dict[str, Any], path: str) -> Any:
     """
     Get value at a specific path in the configuration.
@@ -64,7 +71,7 @@ def get_value_at_path(config: Dict[str, Any], path: str) -> Any:
     Returns:
         Value at path or None if not found
     """
-    parts = path.split('.')
+    parts = _split_path(path)
     current = config
     
     for part in parts:
@@ -85,7 +92,7 @@ def set_value_at_path(config: Dict[str, Any], path: str, value: Any) -> None:
         path: Dot-notation path
         value: Value to set
     """
-    parts = path.split('.')
+    parts = _split_path(path)
     current = config
     
     for i, part in enumerate(parts[:-1]):
@@ -17,6 +17,17 @@ class BaseConfig:
     updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     created_by: str = "system"
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to API response dictionary."""
+        return {
+            'resource_type': self.resource_type,
+            'desired_config': self.desired_config,
+            'version': self.version,
+            'editable': self.editable,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+    
     def to_dynamodb(self) -> Dict[str, Any]:
         """Convert to DynamoDB item."""
         return {
@@ -60,6 +71,21 @@ class ResourceGroup:
     updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     created_by: str = "system"
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to API response dictionary."""
+        return {
+            'group_id': self.group_id,
+            'name': self.name,
+            'resource_type': self.resource_type,
+            'selector': self.selector,
+            'priority': self.priority,
+            'description': self.description,
+            'desired_config': self.desired_config,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'created_by': self.created_by
+        }
+    
     def to_dynamodb(self) -> Dict[str, Any]:
         """Convert to DynamoDB item."""
         return {
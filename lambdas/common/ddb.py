@@ -1,15 +1,32 @@
 """
 DynamoDB utilities for findings storage and retrieval.
 """
+import time
 import boto3
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
 from decimal import Decimal
+from boto3.dynamodb.types import TypeSerializer
 from botocore.exceptions import ClientError
+from .aws import CLIENT_CONFIG
 from .models import Finding
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# BatchWriteItem accepts at most 25 items per request
+BATCH_WRITE_SIZE = 25
+# Number of batches in flight at once
+MAX_WRITE_WORKERS = 4
+# Attempts at resubmitting UnprocessedItems before giving up
+MAX_UNPROCESSED_RETRIES = 8
+
+# Low-level client: unlike resources, clients are safe to share across threads
+_dynamodb_client = boto3.client("dynamodb", region_name="us-west-1", config=CLIENT_CONFIG)
+# Resource for the single-threaded read paths
+_dynamodb = boto3.resource("dynamodb", region_name="us-west-1", config=CLIENT_CONFIG)
+_serializer = TypeSerializer()
+
 
 def python_to_dynamodb(obj: Any) -> Any:
     """Convert Python types to DynamoDB-compatible types."""
@@ -38,37 +55,67 @@ def dynamodb_to_python(obj: Any) -> Any:
         return obj
 
 
-def put_findings(table_name: str, findings: List[Finding]) -> None:
+def _write_batch(table_name: str, items: List[Dict[str, Any]]) -> None:
+    """
+    Write up to 25 items with BatchWriteItem, resubmitting unprocessed items.
+    
+    Args:
+        table_name: DynamoDB table name
+        items: Items already in AttributeValue format
+    """
+    request_items = {table_name: [{"PutRequest": {"Item": item}} for item in items]}
+    
+    for attempt in range(MAX_UNPROCESSED_RETRIES):
+        response = _dynamodb_client.batch_write_item(RequestItems=request_items)
+        request_items = response.get("UnprocessedItems") or {}
+        if not request_items:
+            return
+        # Exponential backoff before retrying throttled items
+        time.sleep(min(0.05 * (2 ** attempt), 2.0))
+    
+    # Raised as a ClientError so callers handle it like any other write failure
+    unprocessed = len(request_items.get(table_name, []))
+    raise ClientError(
+        {
+            "Error": {
+                "Code": "UnprocessedItems",
+                "Message": f"{unprocessed} findings still unprocessed after {MAX_UNPROCESSED_RETRIES} attempts",
+            }
+        },
+        "BatchWriteItem",
+    )
+
+
+def put_findings(table_name: str, findings: List[Union[Finding, Dict[str, Any]]]) -> None:
     """
     Write findings to DynamoDB.
     
+    Findings are split into 25-item batches which are written concurrently.
+    
     Args:
         table_name: DynamoDB table name
-        findings: List of Finding objects
+        findings: List of Finding objects, or their already-built to_dict() output
     """
     if not findings:
         return
     
-    dynamodb = boto3.resource("dynamodb", region_name="us-west-1")
-    table = dynamodb.Table(table_name)
+    items = [
+        {k: _serializer.serialize(v) for k, v in python_to_dynamodb(finding).items()}
+        for finding in (f.to_dict() if isinstance(f, Finding) else f for f in findings)
+    ]
+    chunks = [items[i:i + BATCH_WRITE_SIZE] for i in range(0, len(items), BATCH_WRITE_SIZE)]
     
-    # Batch write in chunks of 25 (DynamoDB limit)
-    chunk_size = 25
-    
-    for i in range(0, len(findings), chunk_size):
-        chunk = findings[i:i + chunk_size]
+    try:
+        with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(chunks))) as executor:
+            futures = [executor.submit(_write_batch, table_name, chunk) for chunk in chunks]
+            for future in futures:
+                future.result()
         
-        try:
-            with table.batch_writer() as batch:
-                for finding in chunk:
-                    item = python_to_dynamodb(finding.to_dict())
-                    batch.put_item(Item=item)
-            
-            logger.info(f"Wrote {len(chunk)} findings to DynamoDB")
-            
-        except ClientError as e:
-            logger.error(f"Error writing findings to DynamoDB: {e}")
-            raise
+        logger.info(f"Wrote {len(findings)} findings to DynamoDB in {len(chunks)} batches")
+        
+    except ClientError as e:
+        logger.error(f"Error writing findings to DynamoDB: {e}")
+        raise
 
 
 def query_findings(
@@ -89,8 +136,7 @@ def query_findings(
     Returns:
         Dict with 'items' and optional 'last_evaluated_key'
     """
-    dynamodb = boto3.resource("dynamodb", region_name="us-west-1")
-    table = dynamodb.Table(table_name)
+    table = _dynamodb.Table(table_name)
     
     query_params = {
         "KeyConditionExpression": "tenant_id = :tenant_id",
@@ -130,8 +176,7 @@ def query_all_findings(table_name: str, tenant_id: str) -> List[Dict[str, Any]]:
     Returns:
         List of all findings for the tenant
     """
-    dynamodb = boto3.resource("dynamodb", region_name="us-west-1")
-    table = dynamodb.Table(table_name)
+    table = _dynamodb.Table(table_name)
     
     all_items = []
     last_evaluated_key = None
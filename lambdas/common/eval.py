@@ -3,12 +3,14 @@ Simplified rule evaluation engine using hierarchical desired configuration.
 
 No complex check types - just compare actual config vs desired config.
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import re
+import time
 import uuid
 import boto3
 from botocore.exceptions import ClientError
+from .aws import CLIENT_CONFIG
 from .models import Resource, Finding
 from .logging import get_logger
 from .config_models import BaseConfig, ResourceGroup
@@ -16,6 +18,34 @@ from .config_merger import deep_merge, compare_configs
 
 logger = get_logger(__name__)
 
+_dynamodb = boto3.resource("dynamodb", region_name="us-west-1", config=CLIENT_CONFIG)
+
+# How long base configs and groups fetched from DynamoDB are reused.
+# Module state survives across warm Lambda invocations, so edits made in
+# the UI take effect on scans after at most this many seconds.
+CONFIG_CACHE_TTL_SECONDS = 60.0
+
+_config_cache: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+_MISSING = object()
+
+
+def _cache_get(key: Tuple[str, str, str]) -> Any:
+    """Return a cached value, or _MISSING if absent or expired."""
+    entry = _config_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < CONFIG_CACHE_TTL_SECONDS:
+        return entry[1]
+    return _MISSING
+
+
+def _cache_put(key: Tuple[str, str, str], value: Any) -> None:
+    """Store a value in the config cache with the current timestamp."""
+    _config_cache[key] = (time.monotonic(), value)
+
+
+# Compiled selectors per (table, resource type), tagged with the groups
+# list they were built from so a refreshed list is recompiled
+_matcher_cache: Dict[Tuple[str, str], Tuple[List[Any], List[Tuple[Any, Callable]]]] = {}
+
 
 def matches_selector(resource: Resource, selector: Dict[str, Any]) -> bool:
     """
@@ -63,6 +93,48 @@ def matches_selector(resource: Resource, selector: Dict[str, Any]) -> bool:
     return True
 
 
+def compile_selector(selector: Dict[str, Any]) -> Callable[[Resource], bool]:
+    """
+    Build a predicate equivalent to matches_selector() for a fixed selector.
+    
+    Patterns are compiled and tag pairs extracted once, so checking a
+    resource only runs the comparisons.
+    
+    Args:
+        selector: Selector criteria
+        
+    Returns:
+        Function taking a resource and returning whether it matches
+    """
+    if not selector:
+        return lambda resource: True
+    
+    tags = list(selector.get("tags", {}).items())
+    arn_regex = re.compile(selector["arn_pattern"]) if "arn_pattern" in selector else None
+    name_regex = re.compile(selector["name_pattern"]) if "name_pattern" in selector else None
+    
+    def matches(resource: Resource) -> bool:
+        if tags:
+            resource_tags = resource.metadata.get("Tags", {})
+            if isinstance(resource_tags, list):
+                resource_tags = {tag.get("Key"): tag.get("Value") for tag in resource_tags}
+            for key, value in tags:
+                if resource_tags.get(key) != value:
+                    return False
+        
+        if arn_regex is not None and not arn_regex.match(resource.arn):
+            return False
+        
+        if name_regex is not None:
+            name = resource.arn.split("/")[-1] if "/" in resource.arn else resource.arn.split(":")[-1]
+            if not name_regex.match(name):
+                return False
+        
+        return True
+    
+    return matches
+
+
 def fetch_base_config(table_name: str, resource_type: str) -> Optional[BaseConfig]:
     """
     Fetch base desired configuration for a resource type from DynamoDB.
@@ -74,9 +146,13 @@ def fetch_base_config(table_name: str, resource_type: str) -> Optional[BaseConfi
     Returns:
         BaseConfig if found, None otherwise
     """
+    cache_key = ("base_config", table_name, resource_type)
+    cached = _cache_get(cache_key)
+    if cached is not _MISSING:
+        return cached
+    
     try:
-        dynamodb = boto3.resource("dynamodb", region_name="us-west-1")
-        table = dynamodb.Table(table_name)  # type: ignore
+        table = _dynamodb.Table(table_name)  # type: ignore
         
         response = table.get_item(
             Key={
@@ -85,64 +161,88 @@ def fetch_base_config(table_name: str, resource_type: str) -> Optional[BaseConfi
             }
         )
         
-        if "Item" in response:
-            return BaseConfig.from_dynamodb(response["Item"])
-        
-        return None
+        base_config = BaseConfig.from_dynamodb(response["Item"]) if "Item" in response else None
+        _cache_put(cache_key, base_config)
+        return base_config
         
     except ClientError as e:
         logger.error(f"Error fetching base config for {resource_type}: {e}")
         return None
 
 
-def fetch_matching_groups(table_name: str, resource: Resource) -> List[ResourceGroup]:
+def fetch_groups_for_type(table_name: str, resource_type: str) -> List[ResourceGroup]:
     """
-    Fetch all resource groups that match the given resource.
+    Fetch all resource groups defined for a resource type.
     
     Args:
         table_name: DynamoDB table name
-        resource: Resource to match against
+        resource_type: AWS resource type (e.g., "AWS::S3::Bucket")
         
     Returns:
-        List of matching ResourceGroup objects, sorted by priority (lowest first)
+        List of ResourceGroup objects for the type, sorted by priority (lowest first)
     """
+    cache_key = ("groups", table_name, resource_type)
+    cached = _cache_get(cache_key)
+    if cached is not _MISSING:
+        return cached
+    
     try:
-        dynamodb = boto3.resource("dynamodb", region_name="us-west-1")
-        table = dynamodb.Table(table_name)  # type: ignore
+        table = _dynamodb.Table(table_name)  # type: ignore
         
         # Query using GSI1 for efficient lookup
         response = table.query(
             IndexName="GSI1",
             KeyConditionExpression="GSI1PK = :resource_type",
             ExpressionAttributeValues={
-                ":resource_type": resource.resource_type
+                ":resource_type": resource_type
             }
         )
         
-        matching_groups = []
-        
-        for item in response.get("Items", []):
+        groups = [
+            ResourceGroup.from_dynamodb(item)
+            for item in response.get("Items", [])
             # Skip non-group items
-            if not item.get("PK", "").startswith("GROUP#"):
-                continue
-                
-            group = ResourceGroup.from_dynamodb(item)
-            
-            # Check if resource matches group selector
-            if matches_selector(resource, group.selector):
-                matching_groups.append(group)
+            if item.get("PK", "").startswith("GROUP#")
+        ]
         
         # Sort by priority (lowest first, so they're applied in correct order)
-        matching_groups.sort(key=lambda g: g.priority)
+        groups.sort(key=lambda g: g.priority)
         
-        return matching_groups
+        _cache_put(cache_key, groups)
+        return groups
         
     except ClientError as e:
-        logger.error(f"Error fetching matching groups for {resource.arn}: {e}")
+        logger.error(f"Error fetching groups for {resource_type}: {e}")
         return []
 
 
-def evaluate_resource(resource: Resource, table_name: str) -> tuple:
+def fetch_matching_groups(table_name: str, resource: Resource) -> List[ResourceGroup]:
+    """
+    Fetch all resource groups that match the given resource.
+    
+    Args:
+        table_name: DynamoDB table name
+        resource: Resource to match against
+        
+    Returns:
+        List of matching ResourceGroup objects, sorted by priority (lowest first)
+    """
+    groups = fetch_groups_for_type(table_name, resource.resource_type)
+    
+    cache_key = (table_name, resource.resource_type)
+    cached = _matcher_cache.get(cache_key)
+    if cached is None or cached[0] is not groups:
+        cached = (groups, [(group, compile_selector(group.selector)) for group in groups])
+        _matcher_cache[cache_key] = cached
+    
+    return [group for group, matches in cached[1] if matches(resource)]
+
+
+def evaluate_resource(
+    resource: Resource,
+    table_name: str,
+    merged_configs: Optional[Dict[Tuple[str, ...], Dict[str, Any]]] = None,
+) -> tuple:
     """
     Evaluate a resource against hierarchical desired configuration.
     
@@ -156,6 +256,8 @@ def evaluate_resource(resource: Resource, table_name: str) -> tuple:
     Args:
         resource: The resource to evaluate
         table_name: DynamoDB table containing configs
+        merged_configs: Optional memo of desired configs keyed by resource
+            type and matching group IDs, shared across one batch of resources
         
     Returns:
         Tuple of (updated_resource, findings_list)
@@ -173,12 +275,19 @@ def evaluate_resource(resource: Resource, table_name: str) -> tuple:
     # 2. Fetch matching groups
     matching_groups = fetch_matching_groups(table_name, resource)
     
-    # 3. Build hierarchical desired config
-    desired_config = base_config.desired_config.copy()
-    
-    # Apply each group's config in priority order
-    for group in matching_groups:
-        desired_config = deep_merge(desired_config, group.desired_config)
+    # 3. Build hierarchical desired config (resources matching the same
+    # groups share it, so each combination is merged only once)
+    merge_key = (resource.resource_type, *(g.group_id for g in matching_groups))
+    desired_config = merged_configs.get(merge_key) if merged_configs is not None else None
+    if desired_config is None:
+        desired_config = base_config.desired_config.copy()
+        
+        # Apply each group's config in priority order
+        for group in matching_groups:
+            desired_config = deep_merge(desired_config, group.desired_config)
+        
+        if merged_configs is not None:
+            merged_configs[merge_key] = desired_config
     
     # 4. Store hierarchy info in resource
     resource.base_config_applied = f"{base_config.resource_type}#{base_config.version}"
@@ -251,10 +360,11 @@ def evaluate_resources(tenant_id: str, resources: List[Resource], table_name: st
     """
     updated_resources = []
     all_findings = []
+    merged_configs: Dict[Tuple[str, ...], Dict[str, Any]] = {}
     
     for resource in resources:
         resource.tenant_id = tenant_id
-        updated_resource, findings = evaluate_resource(resource, table_name)
+        updated_resource, findings = evaluate_resource(resource, table_name, merged_configs)
         updated_resources.append(updated_resource)
         all_findings.extend(findings)
     
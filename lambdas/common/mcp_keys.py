@@ -0,0 +1,59 @@
+"""
+MCP API key validation shared by the MCP authorizer and the MCP server.
+"""
+import time
+from typing import Any, Dict, Optional
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Prefix given to every key by the MCP keys handler
+API_KEY_PREFIX = "thanos_mcp_"
+
+
+def validate_api_key(table: Any, api_key: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Validate an MCP API key and record its use.
+    
+    Keys are stored with api_key as the primary key. Malformed keys are
+    rejected before any DynamoDB call; valid ones get last_used updated.
+    
+    Args:
+        table: DynamoDB Table holding the MCP keys
+        api_key: Key from the x-api-key header
+        
+    Returns:
+        The key's item if it exists, is active and has not expired, else None
+    """
+    if not api_key or not api_key.startswith(API_KEY_PREFIX):
+        return None
+    
+    try:
+        response = table.get_item(Key={"api_key": api_key})
+        key_data = response.get("Item")
+        
+        if not key_data:
+            logger.warning(f"API key not found: {api_key[:20]}...")
+            return None
+        
+        if key_data.get("status") != "active":
+            logger.warning(f"API key is not active: {api_key[:20]}...")
+            return None
+        
+        now = int(time.time())
+        expires_at = key_data.get("expires_at", 0)
+        if expires_at and expires_at < now:
+            logger.warning(f"API key expired: {api_key[:20]}...")
+            return None
+        
+        table.update_item(
+            Key={"api_key": api_key},
+            UpdateExpression="SET last_used = :now",
+            ExpressionAttributeValues={":now": now}
+        )
+        
+        return key_data
+        
+    except Exception as e:
+        logger.error(f"Error validating API key: {e}", exc_info=True)
+        return None
@@ -1,13 +1,25 @@
 """
 Resource normalization for S3, IAM, and Security Groups.
 """
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 from botocore.exceptions import ClientError
+from .aws import CLIENT_CONFIG
 from .models import Resource
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# Upper bound on regions scanned concurrently
+MAX_REGION_WORKERS = 16
+
+# Clients reused across regions and warm invocations, least recently used first
+MAX_CACHED_CLIENTS = 64
+_client_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_client_cache_lock = threading.Lock()
+
 
 def normalize_s3_buckets(s3_client: Any, account_id: str, region: str) -> List[Resource]:
     """
@@ -172,6 +184,97 @@ def normalize_security_groups(ec2_client: Any, account_id: str, region: str) ->
     return resources
 
 
+def _regional_client(
+    service: str,
+    credentials: Optional[Dict[str, str]],
+    region: Optional[str] = None,
+) -> Any:
+    """
+    Return a client for the service, using assumed credentials if present.
+    
+    Clients are cached by service, region and access key ID so that warm
+    invocations and repeated scans with the same credentials skip client
+    construction. Built clients are thread-safe and shared across workers.
+    
+    Args:
+        service: AWS service name
+        credentials: Credentials dict from assume_role, or None for same-account
+        region: AWS region, or None for global services
+        
+    Returns:
+        boto3 client
+    """
+    import boto3
+    
+    key = (service, region, credentials["aws_access_key_id"] if credentials else None)
+    
+    with _client_cache_lock:
+        client = _client_cache.get(key)
+        if client is not None:
+            _client_cache.move_to_end(key)
+            return client
+        
+        # A fresh Session per client: the default session is not thread-safe.
+        # The shared config's adaptive retries back off throttled
+        # describe/list calls when regions run in parallel
+        client = boto3.session.Session().client(
+            service,
+            region_name=region,
+            config=CLIENT_CONFIG,
+            **(credentials or {}),
+        )
+        _client_cache[key] = client
+        if len(_client_cache) > MAX_CACHED_CLIENTS:
+            _client_cache.popitem(last=False)
+        return client
+
+
+def _collect_region(
+    credentials: Optional[Dict[str, str]],
+    account_id: str,
+    region: str,
+    include_global: bool,
+) -> List[Resource]:
+    """
+    Collect resources from a single region.
+    
+    Runs on a worker thread.
+    
+    Args:
+        credentials: AWS credentials from assume_role, or None for same-account scanning
+        account_id: AWS account ID
+        region: Region to scan
+        include_global: Whether to also collect global services (S3, IAM)
+        
+    Returns:
+        Resources collected from the region
+    """
+    resources = []
+    
+    logger.info(f"Collecting resources from region: {region}")
+    
+    if include_global:
+        # S3 (global service, only collect once)
+        s3_client = _regional_client("s3", credentials)
+        s3_resources = normalize_s3_buckets(s3_client, account_id, region)
+        resources.extend(s3_resources)
+        logger.info(f"Collected {len(s3_resources)} S3 buckets")
+        
+        # IAM (global service, only collect once)
+        iam_client = _regional_client("iam", credentials)
+        iam_resources = normalize_iam_policies(iam_client, account_id, region)
+        resources.extend(iam_resources)
+        logger.info(f"Collected {len(iam_resources)} IAM policies")
+    
+    # EC2 Security Groups (regional)
+    ec2_client = _regional_client("ec2", credentials, region)
+    sg_resources = normalize_security_groups(ec2_client, account_id, region)
+    resources.extend(sg_resources)
+    logger.info(f"Collected {len(sg_resources)} security groups from {region}")
+    
+    return resources
+
+
 def collect_resources(
     credentials: Optional[Dict[str, str]],
     account_id: str,
@@ -180,6 +283,9 @@ def collect_resources(
     """
     Collect all resources from the specified regions.
     
+    Regions are scanned concurrently; global services are collected once,
+    alongside the first region. Results keep the order of ``regions``.
+    
     Args:
         credentials: AWS credentials from assume_role, or None for same-account scanning
         account_id: AWS account ID
@@ -188,56 +294,17 @@ def collect_resources(
     Returns:
         List of all collected resources
     """
-    import boto3
+    if not regions:
+        return []
     
     all_resources = []
     
-    for region in regions:
-        logger.info(f"Collecting resources from region: {region}")
-        
-        # S3 (global service, only collect once)
-        if region == regions[0]:
-            if credentials is None:
-                s3_client = boto3.client("s3")
-            else:
-                s3_client = boto3.client(
-                    "s3",
-                    aws_access_key_id=credentials["aws_access_key_id"],
-                    aws_secret_access_key=credentials["aws_secret_access_key"],
-                    aws_session_token=credentials["aws_session_token"],
-                )
-            s3_resources = normalize_s3_buckets(s3_client, account_id, region)
-            all_resources.extend(s3_resources)
-            logger.info(f"Collected {len(s3_resources)} S3 buckets")
-        
-        # IAM (global service, only collect once)
-        if region == regions[0]:
-            if credentials is None:
-                iam_client = boto3.client("iam")
-            else:
-                iam_client = boto3.client(
-                    "iam",
-                    aws_access_key_id=credentials["aws_access_key_id"],
-                    aws_secret_access_key=credentials["aws_secret_access_key"],
-                    aws_session_token=credentials["aws_session_token"],
-                )
-            iam_resources = normalize_iam_policies(iam_client, account_id, region)
-            all_resources.extend(iam_resources)
-            logger.info(f"Collected {len(iam_resources)} IAM policies")
-        
-        # EC2 Security Groups (regional)
-        if credentials is None:
-            ec2_client = boto3.client("ec2", region_name=region)
-        else:
-            ec2_client = boto3.client(
-                "ec2",
-                region_name=region,
-                aws_access_key_id=credentials["aws_access_key_id"],
-                aws_secret_access_key=credentials["aws_secret_access_key"],
-                aws_session_token=credentials["aws_session_token"],
-            )
-        sg_resources = normalize_security_groups(ec2_client, account_id, region)
-        all_resources.extend(sg_resources)
-        logger.info(f"Collected {len(sg_resources)} security groups from {region}")
+    with ThreadPoolExecutor(max_workers=min(MAX_REGION_WORKERS, len(regions))) as executor:
+        futures = [
+            executor.submit(_collect_region, credentials, account_id, region, i == 0)
+            for i, region in enumerate(regions)
+        ]
+        for future in futures:
+            all_resources.extend(future.result())
     
     return all_resources
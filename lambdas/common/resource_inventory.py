@@ -2,14 +2,26 @@
 Resource inventory management for DynamoDB.
 Stores all scanned resources with compliance status and metadata.
 """
+import functools
 import boto3
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from botocore.exceptions import ClientError
+from .aws import CLIENT_CONFIG
 from .models import Resource
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+# Shared across warm invocations so the connection pool is reused
+_dynamodb = boto3.resource('dynamodb', region_name='us-west-1', config=CLIENT_CONFIG)
+
+
+@functools.lru_cache(maxsize=8)
+def _table(table_name: str):
+    """Return a cached Table handle for the given table name."""
+    return _dynamodb.Table(table_name)
+
 
 def put_resources(table_name: str, resources: List[Resource]) -> None:
     """
@@ -23,8 +35,7 @@ def put_resources(table_name: str, resources: List[Resource]) -> None:
         logger.warning("No resources table configured, skipping resource storage")
         return
         
-    dynamodb = boto3.resource('dynamodb', region_name='us-west-1')
-    table = dynamodb.Table(table_name)
+    table = _table(table_name)
     
     successful = 0
     failed = 0
@@ -60,8 +71,7 @@ def get_resources_by_snapshot(
         List of resource dictionaries
     """
     try:
-        dynamodb = boto3.resource('dynamodb', region_name='us-west-1')
-        table = dynamodb.Table(table_name)
+        table = _table(table_name)
         
         response = table.query(
             KeyConditionExpression='PK = :pk',
@@ -97,8 +107,7 @@ def get_resources_by_compliance(
         List of resource dictionaries
     """
     try:
-        dynamodb = boto3.resource('dynamodb', region_name='us-west-1')
-        table = dynamodb.Table(table_name)
+        table = _table(table_name)
         
         response = table.query(
             IndexName='GSI2',
@@ -136,8 +145,7 @@ def get_resources_by_type(
         List of resource dictionaries
     """
     try:
-        dynamodb = boto3.resource('dynamodb', region_name='us-west-1')
-        table = dynamodb.Table(table_name)
+        table = _table(table_name)
         
         response = table.query(
             IndexName='GSI1',
@@ -155,6 +163,65 @@ def get_resources_by_type(
         return []
 
 
+def count_snapshot_resources(
+    table_name: str,
+    tenant_id: str,
+    snapshot_key: str
+) -> Tuple[Counter, Counter]:
+    """
+    Count a snapshot's resources per resource type and compliance status.
+    
+    Only the two counted attributes are projected, so every resource in the
+    snapshot is counted without transferring the rest of its item. Any
+    resource type is counted, not just the ones the normalizers know about.
+    Errors are left to propagate so callers never report a partial count.
+    
+    Args:
+        table_name: Name of the DynamoDB table
+        tenant_id: Tenant identifier
+        snapshot_key: Snapshot key to count
+        
+    Returns:
+        Tuple of (counts by resource_type, counts by compliance_status)
+    """
+    table = _table(table_name)
+    query_params = {
+        'KeyConditionExpression': 'PK = :pk',
+        'ExpressionAttributeValues': {':pk': f"{tenant_id}#{snapshot_key}"},
+        'ProjectionExpression': 'resource_type, compliance_status'
+    }
+    
+    by_type, by_compliance = Counter(), Counter()
+    while True:
+        response = table.query(**query_params)
+        for item in response.get('Items', []):
+            by_type[item.get('resource_type', 'unknown')] += 1
+            by_compliance[item.get('compliance_status', 'unknown')] += 1
+        
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return by_type, by_compliance
+        query_params['ExclusiveStartKey'] = last_evaluated_key
+
+
+_INTERNAL_KEYS = frozenset({'PK', 'SK', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK'})
+
+
+def _clean_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip internal keys from a single DynamoDB item and restore API field names."""
+    clean_item = {k: v for k, v in item.items() if k not in _INTERNAL_KEYS}
+    
+    # Map resource_arn to arn for API compatibility
+    if 'resource_arn' in clean_item:
+        clean_item['arn'] = clean_item.pop('resource_arn')
+    
+    # Convert Decimal to float for drift_score
+    if 'drift_score' in clean_item:
+        clean_item['drift_score'] = float(clean_item['drift_score'])
+    
+    return clean_item
+
+
 def convert_dynamodb_to_dict(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Convert DynamoDB items to clean dictionary format.
@@ -167,20 +234,31 @@ def convert_dynamodb_to_dict(items: List[Dict[str, Any]]) -> List[Dict[str, Any]
     Returns:
         List of cleaned dictionaries
     """
-    cleaned = []
-    internal_keys = {'PK', 'SK', 'GSI1PK', 'GSI1SK', 'GSI2PK', 'GSI2SK'}
+    return [_clean_item(item) for item in items]
+
+
+def convert_and_tally(
+    items: Iterable[Dict[str, Any]],
+    by_type: Counter,
+    by_compliance: Counter
+) -> Iterator[Dict[str, Any]]:
+    """
+    Convert DynamoDB items like convert_dynamodb_to_dict while counting them.
     
-    for item in items:
-        clean_item = {k: v for k, v in item.items() if k not in internal_keys}
-        
-        # Map resource_arn to arn for API compatibility
-        if 'resource_arn' in clean_item:
-            clean_item['arn'] = clean_item.pop('resource_arn')
-        
-        # Convert Decimal to float for drift_score
-        if 'drift_score' in clean_item:
-            clean_item['drift_score'] = float(clean_item['drift_score'])
-        
-        cleaned.append(clean_item)
+    Each cleaned item is yielded as soon as its resource_type and
+    compliance_status have been added to the given counters, so callers
+    get both the resources and their totals from a single pass.
     
-    return cleaned
+    Args:
+        items: DynamoDB items
+        by_type: Counter updated with each item's resource_type
+        by_compliance: Counter updated with each item's compliance_status
+        
+    Yields:
+        Cleaned resource dictionaries
+    """
+    for item in items:
+        clean_item = _clean_item(item)
+        by_type[clean_item.get('resource_type', 'unknown')] += 1
+        by_compliance[clean_item.get('compliance_status', 'unknown')] += 1
+        yield clean_item
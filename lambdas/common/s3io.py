@@ -1,51 +1,128 @@
 """
 S3 I/O utilities for snapshots.
 """
-import json
+import io
+import time
+import zlib
 import boto3
-from typing import Any, Dict, List, Optional
-from datetime import datetime
-from botocore.exceptions import ClientError
+import orjson
+from typing import Any, Dict, Iterable, Iterator, Optional
+from .aws import CLIENT_CONFIG
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+_s3 = boto3.client("s3", config=CLIENT_CONFIG)
+
+# S3 requires every multipart part except the last to be at least 5 MiB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Level 1 is nearly free in CPU and still shrinks repetitive JSON several-fold
+GZIP_LEVEL = 1
+
+
+def _encode_json_array(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode records as a JSON array one element at a time.
+    
+    Args:
+        records: Dicts to encode
+    
+    Yields:
+        Consecutive byte fragments of the array
+    """
+    yield b"["
+    for i, record in enumerate(records):
+        fragment = orjson.dumps(record, default=str, option=orjson.OPT_INDENT_2)
+        yield b",\n" + fragment if i else fragment
+    yield b"]"
+
 
 def write_snapshot(
     bucket: str,
     tenant_id: str,
-    resources: List[Dict[str, Any]],
+    resources: Iterable[Dict[str, Any]],
     timestamp: Optional[str] = None,
 ) -> str:
     """
-    Write resource snapshot to S3.
+    Write a gzip-compressed resource snapshot to S3.
+    
+    Resources are encoded and compressed as they are consumed, so callers
+    can pass a generator and avoid materializing every resource dict at
+    once. Small snapshots go up in a single PUT; larger ones are streamed
+    as a multipart upload.
     
     Args:
         bucket: S3 bucket name
         tenant_id: Tenant identifier
-        resources: List of resource dicts
+        resources: Iterable of resource dicts
         timestamp: Optional timestamp (defaults to now)
-        
+    
     Returns:
         S3 key of the written snapshot
     """
-    s3 = boto3.client("s3")
-    
     if timestamp is None:
-        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        timestamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
     
-    key = f"tenants/{tenant_id}/snapshots/{timestamp}/resources.json"
+    key = f"tenants/{tenant_id}/snapshots/{timestamp}/resources.json.gz"
     
-    try:
-        s3.put_object(
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    upload_id = None
+    parts = []
+    buffer = io.BytesIO()
+    
+    def upload_part() -> None:
+        """Upload the buffered bytes as the next multipart part."""
+        part_number = len(parts) + 1
+        response = _s3.upload_part(
             Bucket=bucket,
             Key=key,
-            Body=json.dumps(resources, indent=2),
-            ContentType="application/json",
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=buffer.getvalue(),
         )
+        parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+    
+    try:
+        for fragment in _encode_json_array(resources):
+            buffer.write(compressor.compress(fragment))
+            if buffer.tell() >= MULTIPART_PART_SIZE:
+                if upload_id is None:
+                    upload_id = _s3.create_multipart_upload(
+                        Bucket=bucket,
+                        Key=key,
+                        ContentType="application/json",
+                        ContentEncoding="gzip",
+                    )["UploadId"]
+                upload_part()
+                buffer = io.BytesIO()
+        
+        buffer.write(compressor.flush())
+        
+        if upload_id is None:
+            _s3.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=buffer.getvalue(),
+                ContentType="application/json",
+                ContentEncoding="gzip",
+            )
+        else:
+            if buffer.tell():
+                upload_part()
+            _s3.complete_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        
         logger.info(f"Wrote snapshot to s3://{bucket}/{key}")
         return key
-    except ClientError as e:
+    except Exception as e:
+        # Encoding errors land here too; an unaborted upload keeps its parts billed
         logger.error(f"Error writing snapshot to S3: {e}")
+        if upload_id is not None:
+            _s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
         raise
-
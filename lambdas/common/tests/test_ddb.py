@@ -0,0 +1,67 @@
+"""
+Tests for DynamoDB findings writes.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+import pytest
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+
+from common import ddb
+
+
+def _findings(count):
+    """Build finding dicts as produced by Finding.to_dict()."""
+    return [
+        {"tenant_id": "test-tenant", "finding_id": f"f-{i}", "severity": "HIGH", "drift": 0.5}
+        for i in range(count)
+    ]
+
+
+@patch("common.ddb.time.sleep")
+@patch("common.ddb._dynamodb_client")
+def test_put_findings_splits_into_batches(mock_client, mock_sleep):
+    """Findings are written in 25-item BatchWriteItem requests."""
+    mock_client.batch_write_item.return_value = {"UnprocessedItems": {}}
+    
+    ddb.put_findings("findings", _findings(60))
+    
+    sizes = sorted(
+        len(call.kwargs["RequestItems"]["findings"])
+        for call in mock_client.batch_write_item.call_args_list
+    )
+    assert sizes == [10, 25, 25]
+    mock_sleep.assert_not_called()
+
+
+@patch("common.ddb.time.sleep")
+@patch("common.ddb._dynamodb_client")
+def test_put_findings_resubmits_unprocessed_items(mock_client, mock_sleep):
+    """Items left unprocessed by the first call are resubmitted."""
+    unprocessed = {"findings": [{"PutRequest": {"Item": {"finding_id": {"S": "f-1"}}}}]}
+    mock_client.batch_write_item.side_effect = [
+        {"UnprocessedItems": unprocessed},
+        {"UnprocessedItems": {}},
+    ]
+    
+    ddb.put_findings("findings", _findings(2))
+    
+    assert mock_client.batch_write_item.call_count == 2
+    assert mock_client.batch_write_item.call_args_list[1].kwargs["RequestItems"] == unprocessed
+    mock_sleep.assert_called_once()
+
+
+@patch("common.ddb.time.sleep")
+@patch("common.ddb._dynamodb_client")
+def test_put_findings_raises_client_error_when_retries_exhausted(mock_client, mock_sleep):
+    """Exhausted retries surface as a ClientError like other write failures."""
+    unprocessed = {"findings": [{"PutRequest": {"Item": {"finding_id": {"S": "f-1"}}}}]}
+    mock_client.batch_write_item.return_value = {"UnprocessedItems": unprocessed}
+    
+    with pytest.raises(ClientError) as exc_info:
+        ddb.put_findings("findings", _findings(1))
+    
+    assert exc_info.value.response["Error"]["Code"] == "UnprocessedItems"
+    assert mock_client.batch_write_item.call_count == ddb.MAX_UNPROCESSED_RETRIES
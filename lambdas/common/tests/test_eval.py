@@ -0,0 +1,139 @@
+"""
+Tests for selector compilation and desired-config caching in evaluation.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+import pytest
+from unittest.mock import patch
+
+from common import eval as evaluation
+from common.config_merger import deep_merge
+from common.config_models import BaseConfig, ResourceGroup
+from common.models import Resource
+
+BUCKET = "AWS::S3::Bucket"
+
+
+def _bucket(name, tags=None):
+    """Build an S3 bucket resource."""
+    return Resource(
+        arn=f"arn:aws:s3:::{name}",
+        resource_type=BUCKET,
+        config={"Versioning": "Disabled"},
+        region="us-east-1",
+        account_id="123456789012",
+        metadata={"Tags": tags or {}},
+    )
+
+
+def _group(group_id, selector, priority=100):
+    """Build a resource group for S3 buckets."""
+    return ResourceGroup(
+        group_id=group_id,
+        name=group_id,
+        resource_type=BUCKET,
+        selector=selector,
+        priority=priority,
+        desired_config={"Owner": group_id},
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Isolate the module-level caches between tests."""
+    evaluation._config_cache.clear()
+    evaluation._matcher_cache.clear()
+    yield
+    evaluation._config_cache.clear()
+    evaluation._matcher_cache.clear()
+
+
+@pytest.mark.parametrize("selector", [
+    {},
+    {"tags": {"env": "prod"}},
+    {"tags": {"env": "prod", "team": "data"}},
+    {"arn_pattern": r"arn:aws:s3:::logs-"},
+    {"name_pattern": r"^data-"},
+    {"tags": {"env": "prod"}, "name_pattern": r"^logs-"},
+])
+def test_compile_selector_matches_matches_selector(selector):
+    """Compiled selectors agree with matches_selector() on every resource."""
+    resources = [
+        _bucket("logs-1", {"env": "prod"}),
+        _bucket("data-1", {"env": "prod", "team": "data"}),
+        _bucket("data-2", [{"Key": "env", "Value": "dev"}]),
+        _bucket("other"),
+    ]
+    compiled = evaluation.compile_selector(selector)
+    
+    for resource in resources:
+        assert compiled(resource) == evaluation.matches_selector(resource, selector)
+
+
+def test_fetch_matching_groups_reuses_compiled_selectors():
+    """Selectors are compiled once per groups list, not once per resource."""
+    groups = [_group("prod", {"tags": {"env": "prod"}})]
+    
+    with patch.object(evaluation, "fetch_groups_for_type", return_value=groups), \
+            patch.object(evaluation, "compile_selector", wraps=evaluation.compile_selector) as mock_compile:
+        matched = evaluation.fetch_matching_groups("configs", _bucket("a", {"env": "prod"}))
+        unmatched = evaluation.fetch_matching_groups("configs", _bucket("b", {"env": "dev"}))
+    
+    assert matched == groups
+    assert unmatched == []
+    assert mock_compile.call_count == 1
+
+
+def test_fetch_matching_groups_recompiles_refreshed_groups():
+    """A new groups list, as returned after a cache refresh, is recompiled."""
+    first = [_group("prod", {"tags": {"env": "prod"}})]
+    refreshed = [_group("prod", {"tags": {"env": "dev"}})]
+    resource = _bucket("a", {"env": "dev"})
+    
+    with patch.object(evaluation, "fetch_groups_for_type", return_value=first):
+        assert evaluation.fetch_matching_groups("configs", resource) == []
+    with patch.object(evaluation, "fetch_groups_for_type", return_value=refreshed):
+        assert evaluation.fetch_matching_groups("configs", resource) == refreshed
+
+
+def test_evaluate_resources_merges_each_group_combination_once():
+    """Resources matching the same groups share one merged desired config."""
+    base = BaseConfig(resource_type=BUCKET, desired_config={"Versioning": "Enabled"})
+    groups = [
+        _group("prod", {"tags": {"env": "prod"}}, priority=1),
+        _group("logs", {"name_pattern": r"^logs-"}, priority=2),
+    ]
+    resources = [
+        _bucket("logs-1", {"env": "prod"}),
+        _bucket("logs-2", {"env": "prod"}),
+        _bucket("data-1", {"env": "prod"}),
+        _bucket("data-2", {"env": "prod"}),
+    ]
+    
+    with patch.object(evaluation, "fetch_base_config", return_value=base), \
+            patch.object(evaluation, "fetch_groups_for_type", return_value=groups), \
+            patch.object(evaluation, "deep_merge", wraps=deep_merge) as mock_merge:
+        evaluated, findings = evaluation.evaluate_resources("tenant-1", resources, "configs")
+    
+    # prod+logs for the two logs buckets (2 merges), prod alone for the rest (1 merge)
+    assert mock_merge.call_count == 3
+    assert evaluated[0].desired_config is evaluated[1].desired_config
+    assert evaluated[2].desired_config is evaluated[3].desired_config
+    assert evaluated[0].desired_config == {"Versioning": "Enabled", "Owner": "logs"}
+    assert evaluated[2].desired_config == {"Versioning": "Enabled", "Owner": "prod"}
+    assert evaluated[0].groups_applied == ["prod", "logs"]
+    assert len(findings) == 4
+
+
+def test_evaluate_resource_without_memo():
+    """evaluate_resource works without a shared memo."""
+    base = BaseConfig(resource_type=BUCKET, desired_config={"Versioning": "Disabled"})
+    
+    with patch.object(evaluation, "fetch_base_config", return_value=base), \
+            patch.object(evaluation, "fetch_groups_for_type", return_value=[]):
+        resource, findings = evaluation.evaluate_resource(_bucket("a"), "configs")
+    
+    assert resource.compliance_status == "COMPLIANT"
+    assert findings == []
@@ -0,0 +1,56 @@
+"""
+Tests for shared MCP API key validation.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+import time
+from unittest.mock import Mock
+
+from common.mcp_keys import validate_api_key
+
+API_KEY = "thanos_mcp_abc123"
+
+
+def _table(item=None):
+    """Build a mocked keys table returning the given item."""
+    table = Mock()
+    table.get_item.return_value = {"Item": item} if item is not None else {}
+    return table
+
+
+def test_validate_api_key_accepts_active_key():
+    """An active, unexpired key is returned and its last_used updated."""
+    item = {"api_key": API_KEY, "status": "active", "user_email": "a@example.com",
+            "expires_at": int(time.time()) + 3600}
+    table = _table(item)
+    
+    assert validate_api_key(table, API_KEY) == item
+    table.update_item.assert_called_once()
+    assert table.update_item.call_args.kwargs["Key"] == {"api_key": API_KEY}
+
+
+def test_validate_api_key_rejects_malformed_key_without_lookup():
+    """Keys without the MCP prefix never reach DynamoDB."""
+    table = _table()
+    
+    assert validate_api_key(table, "not-a-thanos-key") is None
+    assert validate_api_key(table, None) is None
+    table.get_item.assert_not_called()
+
+
+def test_validate_api_key_rejects_unknown_inactive_and_expired_keys():
+    """Missing, revoked and expired keys are rejected without updating last_used."""
+    expired = {"status": "active", "expires_at": int(time.time()) - 1}
+    for table in (_table(), _table({"status": "revoked"}), _table(expired)):
+        assert validate_api_key(table, API_KEY) is None
+        table.update_item.assert_not_called()
+
+
+def test_validate_api_key_rejects_on_dynamodb_error():
+    """Lookup failures deny access instead of raising."""
+    table = _table()
+    table.get_item.side_effect = RuntimeError("unavailable")
+    
+    assert validate_api_key(table, API_KEY) is None
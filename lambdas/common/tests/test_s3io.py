@@ -0,0 +1,105 @@
+"""
+Tests for S3 snapshot writes.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+import gzip
+import json
+import boto3
+import pytest
+from unittest.mock import Mock, patch
+from moto import mock_aws
+
+from common import s3io
+
+BUCKET = "test-snapshots"
+
+
+@pytest.fixture
+def s3_client():
+    """Create a mocked snapshots bucket and point s3io at it."""
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        with patch.object(s3io, "_s3", client):
+            yield client
+
+
+@pytest.fixture
+def stub_s3():
+    """Stub the S3 client with small parts so tests exercise multipart."""
+    client = Mock()
+    client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    client.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+    with patch.object(s3io, "_s3", client), \
+            patch.object(s3io, "MULTIPART_PART_SIZE", 16 * 1024):
+        yield client
+
+
+def _resources(count):
+    """Build resource dicts with incompressible payloads."""
+    return [{"arn": f"arn:{i}", "payload": os.urandom(512).hex()} for i in range(count)]
+
+
+def _read_snapshot(client, key):
+    """Download and decode a snapshot written by write_snapshot."""
+    body = client.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+    return json.loads(gzip.decompress(body))
+
+
+def test_write_snapshot_small_uses_single_put(s3_client):
+    """Snapshots under the part size go up in one PUT."""
+    resources = _resources(3)
+    
+    with patch.object(s3_client, "create_multipart_upload") as mock_create:
+        key = s3io.write_snapshot(BUCKET, "tenant-1", iter(resources), "20240101-000000")
+    
+    mock_create.assert_not_called()
+    assert key == "tenants/tenant-1/snapshots/20240101-000000/resources.json.gz"
+    assert _read_snapshot(s3_client, key) == resources
+    head = s3_client.head_object(Bucket=BUCKET, Key=key)
+    assert head["ContentEncoding"] == "gzip"
+
+
+def test_write_snapshot_large_uses_multipart(stub_s3):
+    """Snapshots over the part size are streamed as a multipart upload."""
+    resources = _resources(200)
+    
+    key = s3io.write_snapshot(BUCKET, "tenant-1", iter(resources), "20240101-000000")
+    
+    stub_s3.put_object.assert_not_called()
+    part_calls = stub_s3.upload_part.call_args_list
+    assert len(part_calls) > 1
+    assert [c.kwargs["PartNumber"] for c in part_calls] == list(range(1, len(part_calls) + 1))
+    assert all(c.kwargs["UploadId"] == "upload-1" for c in part_calls)
+    body = b"".join(c.kwargs["Body"] for c in part_calls)
+    assert json.loads(gzip.decompress(body)) == resources
+    
+    stub_s3.complete_multipart_upload.assert_called_once_with(
+        Bucket=BUCKET,
+        Key=key,
+        UploadId="upload-1",
+        MultipartUpload={"Parts": [
+            {"ETag": f"etag-{i}", "PartNumber": i} for i in range(1, len(part_calls) + 1)
+        ]},
+    )
+    stub_s3.abort_multipart_upload.assert_not_called()
+
+
+def test_write_snapshot_aborts_multipart_on_encoding_error(stub_s3):
+    """A record that fails to encode mid-upload aborts the multipart upload."""
+    # orjson rejects integers outside the 64-bit range
+    resources = _resources(200) + [{"arn": "arn:bad", "size": 2 ** 70}]
+    
+    with pytest.raises(TypeError):
+        s3io.write_snapshot(BUCKET, "tenant-1", iter(resources), "20240101-000000")
+    
+    stub_s3.upload_part.assert_called()
+    stub_s3.complete_multipart_upload.assert_not_called()
+    stub_s3.abort_multipart_upload.assert_called_once_with(
+        Bucket=BUCKET,
+        Key="tenants/tenant-1/snapshots/20240101-000000/resources.json.gz",
+        UploadId="upload-1",
+    )
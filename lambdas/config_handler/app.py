@@ -143,15 +143,7 @@ def list_base_configs() -> Dict[str, Any]:
         configs = []
         for item in scan_response.get('Items', []):
             try:
-                config = BaseConfig.from_dynamodb(item)
-                configs.append({
-                    'resource_type': config.resource_type,
-                    'desired_config': config.desired_config,
-                    'version': config.version,
-                    'editable': config.editable,
-                    'created_at': config.created_at,
-                    'updated_at': config.updated_at
-                })
+                configs.append(BaseConfig.from_dynamodb(item).to_dict())
             except Exception as e:
                 logger.warning(f"Error parsing base config: {e}")
         
@@ -178,14 +170,7 @@ def get_base_config(resource_type: str) -> Dict[str, Any]:
         
         config = BaseConfig.from_dynamodb(item)
         
-        return response(200, {
-            'resource_type': config.resource_type,
-            'desired_config': config.desired_config,
-            'version': config.version,
-            'editable': config.editable,
-            'created_at': config.created_at,
-            'updated_at': config.updated_at
-        })
+        return response(200, config.to_dict())
     
     except Exception as e:
         logger.error(f"Error getting base config: {e}")
@@ -4,13 +4,9 @@ Retrieves findings from DynamoDB.
 """
 import json
 import os
-import sys
 from decimal import Decimal
 from typing import Any, Dict
 
-# Add common to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from common.ddb import query_findings
 from common.logging import get_logger
 
@@ -25,6 +25,20 @@ dynamodb = boto3.resource('dynamodb')
 resource_groups_table_name = os.environ.get('RESOURCE_GROUPS_TABLE', 'cloud-golden-guard-dev-resource-groups')
 resource_groups_table = dynamodb.Table(resource_groups_table_name)
 
+# Request field -> DynamoDB attribute for PATCH/PUT /groups/{group_id}
+_UPDATABLE_FIELDS = (
+    ('name', 'name'),
+    ('description', 'description'),
+    ('selector', 'selector'),
+    ('priority', 'priority'),
+    ('desired_config', 'desired_config'),
+)
+
+
+def _group_key(group_id: str) -> Dict[str, str]:
+    """Build the primary key for a resource group item."""
+    return {'PK': 'GROUP#' + group_id, 'SK': 'METADATA'}
+
 
 def get_cors_headers() -> Dict[str, str]:
     """Get CORS headers for responses."""
@@ -109,19 +123,7 @@ def list_groups(resource_type: str = None) -> Dict[str, Any]:
         groups = []
         for item in response.get('Items', []):
             try:
-                group = ResourceGroup.from_dynamodb(item)
-                groups.append({
-                    'group_id': group.group_id,
-                    'name': group.name,
-                    'resource_type': group.resource_type,
-                    'selector': group.selector,
-                    'priority': group.priority,
-                    'description': group.description,
-                    'desired_config': group.desired_config,
-                    'created_at': group.created_at,
-                    'updated_at': group.updated_at,
-                    'created_by': group.created_by
-                })
+                groups.append(ResourceGroup.from_dynamodb(item).to_dict())
             except Exception as e:
                 logger.warning(f"Error parsing group: {e}")
         
@@ -139,10 +141,7 @@ def get_group(group_id: str) -> Dict[str, Any]:
     """Get a specific resource group."""
     try:
         response = resource_groups_table.get_item(
-            Key={
-                'PK': f'GROUP#{group_id}',
-                'SK': 'METADATA'
-            }
+            Key=_group_key(group_id)
         )
         
         item = response.get('Item')
@@ -151,18 +150,7 @@ def get_group(group_id: str) -> Dict[str, Any]:
         
         group = ResourceGroup.from_dynamodb(item)
         
-        return response(200, {
-            'group_id': group.group_id,
-            'name': group.name,
-            'resource_type': group.resource_type,
-            'selector': group.selector,
-            'priority': group.priority,
-            'description': group.description,
-            'desired_config': group.desired_config,
-            'created_at': group.created_at,
-            'updated_at': group.updated_at,
-            'created_by': group.created_by
-        })
+        return response(200, group.to_dict())
     
     except Exception as e:
         logger.error(f"Error getting group: {e}", exc_info=True)
@@ -214,10 +202,7 @@ def update_group(group_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
     try:
         # Get existing group
         response = resource_groups_table.get_item(
-            Key={
-                'PK': f'GROUP#{group_id}',
-                'SK': 'METADATA'
-            }
+            Key=_group_key(group_id)
         )
         
         item = response.get('Item')
@@ -235,15 +220,7 @@ def update_group(group_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         expr_attr_values[':updated_at'] = datetime.utcnow().isoformat()
         
         # Update other fields if provided
-        updatable_fields = {
-            'name': 'name',
-            'description': 'description',
-            'selector': 'selector',
-            'priority': 'priority',
-            'desired_config': 'desired_config'
-        }
-        
-        for data_key, db_key in updatable_fields.items():
+        for data_key, db_key in _UPDATABLE_FIELDS:
             if data_key in data:
                 placeholder = f'#{db_key}'
                 value_placeholder = f':{db_key}'
@@ -264,10 +241,7 @@ def update_group(group_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         
         # Perform update
         resource_groups_table.update_item(
-            Key={
-                'PK': f'GROUP#{group_id}',
-                'SK': 'METADATA'
-            },
+            Key=_group_key(group_id),
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expr_attr_names,
             ExpressionAttributeValues=expr_attr_values
@@ -290,10 +264,7 @@ def delete_group(group_id: str) -> Dict[str, Any]:
     try:
         # Check if group exists
         response = resource_groups_table.get_item(
-            Key={
-                'PK': f'GROUP#{group_id}',
-                'SK': 'METADATA'
-            }
+            Key=_group_key(group_id)
         )
         
         if 'Item' not in response:
@@ -301,10 +272,7 @@ def delete_group(group_id: str) -> Dict[str, Any]:
         
         # Delete the group
         resource_groups_table.delete_item(
-            Key={
-                'PK': f'GROUP#{group_id}',
-                'SK': 'METADATA'
-            }
+            Key=_group_key(group_id)
         )
         
         logger.info(f"Deleted group {group_id}")
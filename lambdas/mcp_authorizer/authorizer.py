@@ -0,0 +1,44 @@
+"""
+MCP API key authorizer for API Gateway.
+
+Runs as a REQUEST authorizer in front of the hosted MCP server routes, so
+malformed or unknown keys are rejected before the MCP server Lambda is
+invoked. API Gateway caches the result per x-api-key value, which lets
+repeat requests from the same client skip the DynamoDB lookup entirely.
+"""
+import os
+import logging
+import boto3
+
+from common.mcp_keys import validate_api_key
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
+
+dynamodb = boto3.resource('dynamodb')
+mcp_keys_table = dynamodb.Table(os.environ['MCP_KEYS_TABLE'])
+
+_DENY = {'isAuthorized': False}
+
+
+def lambda_handler(event, context):
+    """
+    Validate the MCP API key from the x-api-key header.
+    
+    Returns a simple response whose context is exposed to the MCP server as
+    event['requestContext']['authorizer']['lambda'].
+    """
+    headers = event.get('headers') or {}
+    
+    # Only runs on cache misses, so last_used is accurate to the cache TTL
+    key_data = validate_api_key(mcp_keys_table, headers.get('x-api-key'))
+    if not key_data:
+        return _DENY
+    
+    return {
+        'isAuthorized': True,
+        'context': {
+            'user_email': key_data.get('user_email', ''),
+            'name': key_data.get('name', ''),
+        }
+    }
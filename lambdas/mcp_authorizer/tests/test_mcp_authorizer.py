@@ -0,0 +1,60 @@
+"""
+Tests for the MCP API key authorizer.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+os.environ.setdefault("MCP_KEYS_TABLE", "test-mcp-keys")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-1")
+
+import time
+from unittest.mock import Mock, patch
+
+from mcp_authorizer import authorizer
+
+API_KEY = "thanos_mcp_abc123"
+
+
+def _event(api_key=None):
+    """Build an HTTP API authorizer event."""
+    return {"headers": {"x-api-key": api_key} if api_key else {}}
+
+
+def _table(item=None):
+    """Build a mocked keys table returning the given item."""
+    table = Mock()
+    table.get_item.return_value = {"Item": item} if item is not None else {}
+    return table
+
+
+def test_authorizer_allows_active_key():
+    """Active keys are authorized with the user's info in the context."""
+    table = _table({"status": "active", "user_email": "a@example.com", "name": "laptop",
+                    "expires_at": int(time.time()) + 3600})
+    
+    with patch.object(authorizer, "mcp_keys_table", table):
+        response = authorizer.lambda_handler(_event(API_KEY), Mock())
+    
+    assert response == {
+        "isAuthorized": True,
+        "context": {"user_email": "a@example.com", "name": "laptop"},
+    }
+
+
+def test_authorizer_denies_missing_and_malformed_keys():
+    """Requests without a well-formed key are denied before any lookup."""
+    table = _table()
+    
+    with patch.object(authorizer, "mcp_keys_table", table):
+        assert authorizer.lambda_handler(_event(), Mock()) == {"isAuthorized": False}
+        assert authorizer.lambda_handler(_event("wrong-prefix"), Mock()) == {"isAuthorized": False}
+    
+    table.get_item.assert_not_called()
+
+
+def test_authorizer_denies_unknown_revoked_and_expired_keys():
+    """Keys that fail the DynamoDB checks are denied."""
+    expired = {"status": "active", "expires_at": int(time.time()) - 1}
+    for table in (_table(), _table({"status": "revoked"}), _table(expired)):
+        with patch.object(authorizer, "mcp_keys_table", table):
+            assert authorizer.lambda_handler(_event(API_KEY), Mock()) == {"isAuthorized": False}
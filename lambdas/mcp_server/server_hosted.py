@@ -11,10 +11,11 @@ import logging
 from typing import Dict, Any, List, Optional
 import boto3
 from boto3.dynamodb.conditions import Key
-from datetime import datetime
+
+from common.mcp_keys import validate_api_key
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
 
 # DynamoDB client
 dynamodb = boto3.resource('dynamodb')
@@ -23,6 +24,44 @@ mcp_keys_table = dynamodb.Table(os.environ['MCP_KEYS_TABLE'])
 # Lambda client for direct invocation
 lambda_client = boto3.client('lambda')
 
+# Response headers and error responses are identical on every request, so
+# they are built once; the Lambda runtime only reads the returned dicts
+_JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+_CORS_PREFLIGHT_RESPONSE = {
+    'statusCode': 200,
+    'headers': {
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+        'Access-Control-Allow-Headers': 'x-api-key, content-type, authorization',
+        'Access-Control-Max-Age': '86400'
+    },
+    'body': ''
+}
+
+
+def _jsonrpc_error_response(status_code: int, code: int, message: str) -> Dict[str, Any]:
+    """Build an HTTP response carrying a JSON-RPC error with a null id."""
+    return {
+        'statusCode': status_code,
+        'headers': _JSON_HEADERS,
+        'body': json.dumps({
+            'jsonrpc': '2.0',
+            'error': {
+                'code': code,
+                'message': message
+            },
+            'id': None
+        })
+    }
+
+
+_ERR_NO_KEY = _jsonrpc_error_response(401, -32000, 'Missing x-api-key header')
+_ERR_BAD_KEY = _jsonrpc_error_response(401, -32000, 'Invalid or inactive API key')
+_ERR_NOT_FOUND = _jsonrpc_error_response(404, -32601, 'Endpoint not found')
+
 # Lambda function names from environment
 CUSTOMERS_LAMBDA = os.environ.get('CUSTOMERS_LAMBDA_NAME', '')
 FINDINGS_LAMBDA = os.environ.get('FINDINGS_LAMBDA_NAME', '')
@@ -79,49 +118,6 @@ def invoke_lambda(function_name: str, event: Dict[str, Any]) -> Dict[str, Any]:
         raise
 
 
-def validate_api_key(api_key: str) -> Optional[Dict[str, Any]]:
-    """
-    Validate an API key and return the associated user info.
-    Keys are stored with api_key as the primary key in DynamoDB.
-    """
-    if not api_key:
-        return None
-    
-    try:
-        # Look up by api_key directly (stored as primary key in DynamoDB)
-        response = mcp_keys_table.get_item(Key={'api_key': api_key})
-        
-        if 'Item' not in response:
-            logger.warning(f"API key not found: {api_key[:20]}...")
-            return None
-        
-        key_data = response['Item']
-        
-        # Check if key is active
-        if key_data.get('status') != 'active':
-            logger.warning(f"API key is not active: {api_key[:20]}...")
-            return None
-        
-        # Check expiration
-        expires_at = key_data.get('expires_at', 0)
-        if expires_at and expires_at < int(datetime.now().timestamp()):
-            logger.warning(f"API key expired: {api_key[:20]}...")
-            return None
-        
-        # Update last_used timestamp
-        mcp_keys_table.update_item(
-            Key={'api_key': api_key},
-            UpdateExpression='SET last_used = :now',
-            ExpressionAttributeValues={':now': int(datetime.now().timestamp())}
-        )
-        
-        return key_data
-        
-    except Exception as e:
-        logger.error(f"Error validating API key: {e}", exc_info=True)
-        return None
-
-
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler for MCP server.
@@ -129,7 +125,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Supports both Lambda Function URL and API Gateway v2 event formats.
     """
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received event: {json.dumps(event)}")
         
         # Get request details
         http_method = event.get('requestContext', {}).get('http', {}).get('method') or event.get('httpMethod', 'GET')
@@ -137,16 +134,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         # Handle OPTIONS for CORS
         if http_method == 'OPTIONS':
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
-                    'Access-Control-Allow-Headers': 'x-api-key, content-type, authorization',
-                    'Access-Control-Max-Age': '86400'
-                },
-                'body': ''
-            }
+            return _CORS_PREFLIGHT_RESPONSE
         
         # Normalize path (remove trailing slash, handle /mcp prefix)
         # API Gateway passes full path including /mcp
@@ -160,6 +148,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         logger.info(f"Processing request: {http_method} {original_path} -> {path}")
         
+        # Requests through API Gateway were already validated by the MCP
+        # authorizer, which shares common.mcp_keys.validate_api_key; only
+        # Function URL requests still need the key lookup
+        key_data = (event.get('requestContext', {}).get('authorizer') or {}).get('lambda')
+        if key_data:
+            logger.info(f"Authenticated request from {key_data.get('user_email')}: {http_method} {path}")
+            return route_request(event, key_data, http_method, path)
+        
         # Extract API key from headers (normalize header names)
         headers = event.get('headers', {}) or {}
         # API Gateway v2 lowercases header names, Lambda Function URL might not
@@ -167,93 +163,51 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                   headers.get('X-API-Key'))
         
         # ALL requests require API key for security
-        # MCP clients should include the API key in the initial handshake
+        # MCP clients should include the API key in the initial handshake.
+        # Behind API Gateway a missing key never gets here: the gateway
+        # answers with its own 401 {"message": "Unauthorized"}
         if not api_key:
             logger.warning("Request missing x-api-key header")
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'jsonrpc': '2.0',
-                    'error': {
-                        'code': -32000,
-                        'message': 'Missing x-api-key header'
-                    },
-                    'id': None
-                })
-            }
+            return _ERR_NO_KEY
         
         # Validate API key
-        key_data = validate_api_key(api_key)
+        key_data = validate_api_key(mcp_keys_table, api_key)
         if not key_data:
             logger.warning(f"Invalid API key: {api_key[:20]}...")
-            return {
-                'statusCode': 401,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'jsonrpc': '2.0',
-                    'error': {
-                        'code': -32000,
-                        'message': 'Invalid or inactive API key'
-                    },
-                    'id': None
-                })
-            }
+            return _ERR_BAD_KEY
         
         logger.info(f"Authenticated request from {key_data.get('user_email')}: {http_method} {path}")
         
-        # Route to appropriate handler (all require authentication now)
-        if path == '/initialize' or path == '/init' or path.endswith('/initialize') or path.endswith('/init'):
-            return handle_initialize(event, key_data)
-        elif path == '/register' or path.endswith('/register'):
-            return handle_register(event, key_data)
-        elif path == '/messages' or path.endswith('/messages'):
-            return handle_message(event, key_data)
-        elif path == '/sse' or path.endswith('/sse'):
-            return handle_sse_stream(event, key_data)
-        elif http_method == 'POST':
-            # Default POST handler for MCP messages
-            return handle_message(event, key_data)
-        else:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'jsonrpc': '2.0',
-                    'error': {
-                        'code': -32601,
-                        'message': 'Endpoint not found'
-                    },
-                    'id': None
-                })
-            }
+        return route_request(event, key_data, http_method, path)
             
     except Exception as e:
         logger.error(f"Error in lambda_handler: {e}", exc_info=True)
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'jsonrpc': '2.0',
-                'error': {
-                    'code': -32603,
-                    'message': f'Internal server error: {str(e)}'
-                },
-                'id': None
-            })
-        }
+        return _jsonrpc_error_response(500, -32603, f'Internal server error: {str(e)}')
+
+
+def route_request(event: Dict[str, Any], key_data: Dict[str, Any], http_method: str, path: str) -> Dict[str, Any]:
+    """
+    Route an authenticated request to the appropriate handler.
+    
+    Args:
+        event: Lambda event
+        key_data: Info for the validated API key
+        http_method: HTTP method of the request
+        path: Request path with the /mcp prefix removed
+    """
+    if path == '/initialize' or path == '/init' or path.endswith('/initialize') or path.endswith('/init'):
+        return handle_initialize(event, key_data)
+    elif path == '/register' or path.endswith('/register'):
+        return handle_register(event, key_data)
+    elif path == '/messages' or path.endswith('/messages'):
+        return handle_message(event, key_data)
+    elif path == '/sse' or path.endswith('/sse'):
+        return handle_sse_stream(event, key_data)
+    elif http_method == 'POST':
+        # Default POST handler for MCP messages
+        return handle_message(event, key_data)
+    else:
+        return _ERR_NOT_FOUND
 
 
 def handle_initialize(event: Dict[str, Any], key_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -325,10 +279,7 @@ def handle_initialize_jsonrpc(params: Dict[str, Any], msg_id: Any) -> Dict[str,
     
     return {
         'statusCode': 200,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
+        'headers': _JSON_HEADERS,
         'body': json.dumps({
             'jsonrpc': '2.0',
             'result': result,
@@ -504,12 +455,10 @@ def handle_tools_list() -> Dict[str, Any]:
     """
     Return list of available MCP tools (legacy format).
     """
-    tools = get_mcp_tools()
-    
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json'},
-        'body': json.dumps({'tools': tools})
+        'body': f'{{"tools": {_TOOLS_JSON}}}'
     }
 
 
@@ -517,16 +466,11 @@ def handle_tools_list_jsonrpc(msg_id: Any) -> Dict[str, Any]:
     """
     Return list of available MCP tools (JSON-RPC format).
     """
-    tools = get_mcp_tools()
-    
+    # Only the request id varies, so splice it into the pre-serialized tools
     return {
         'statusCode': 200,
         'headers': {'Content-Type': 'application/json'},
-        'body': json.dumps({
-            'jsonrpc': '2.0',
-            'result': {'tools': tools},
-            'id': msg_id
-        })
+        'body': f'{{"jsonrpc": "2.0", "result": {{"tools": {_TOOLS_JSON}}}, "id": {json.dumps(msg_id)}}}'
     }
 
 
@@ -614,6 +558,10 @@ def get_mcp_tools() -> List[Dict[str, Any]]:
     ]
 
 
+# Tool definitions never change at runtime, so serialize them once
+_TOOLS_JSON = json.dumps(get_mcp_tools())
+
+
 def handle_tool_call(params: Dict[str, Any], key_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute an MCP tool call (legacy format).
@@ -672,10 +620,7 @@ def handle_tool_call_jsonrpc(params: Dict[str, Any], key_data: Dict[str, Any], m
         
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
+            'headers': _JSON_HEADERS,
             'body': json.dumps({
                 'jsonrpc': '2.0',
                 'result': result,
@@ -687,10 +632,7 @@ def handle_tool_call_jsonrpc(params: Dict[str, Any], key_data: Dict[str, Any], m
         logger.error(f"Error executing tool {tool_name}: {e}", exc_info=True)
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
+            'headers': _JSON_HEADERS,
             'body': json.dumps({
                 'jsonrpc': '2.0',
                 'error': {
@@ -0,0 +1,59 @@
+"""
+Tests for MCP server request authentication and routing.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+os.environ.setdefault("MCP_KEYS_TABLE", "test-mcp-keys")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-1")
+
+import json
+from unittest.mock import Mock, patch
+
+from mcp_server import server_hosted
+
+API_KEY = "thanos_mcp_abc123"
+
+
+def _event(path, authorizer=None, api_key=None):
+    """Build an API Gateway v2 / Function URL event."""
+    event = {
+        "rawPath": path,
+        "headers": {"x-api-key": api_key} if api_key else {},
+        "requestContext": {"http": {"method": "POST"}},
+    }
+    if authorizer is not None:
+        event["requestContext"]["authorizer"] = {"lambda": authorizer}
+    return event
+
+
+@patch("mcp_server.server_hosted.validate_api_key")
+def test_authorizer_context_skips_key_lookup(mock_validate):
+    """Requests carrying the authorizer context are routed without a lookup."""
+    key_data = {"user_email": "a@example.com", "name": "laptop"}
+    
+    response = server_hosted.lambda_handler(_event("/mcp/initialize", authorizer=key_data), Mock())
+    
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["user"] == "a@example.com"
+    mock_validate.assert_not_called()
+
+
+@patch("mcp_server.server_hosted.validate_api_key")
+def test_function_url_request_validates_key(mock_validate):
+    """Without the authorizer context the key is validated in the function."""
+    mock_validate.return_value = {"user_email": "a@example.com"}
+    
+    response = server_hosted.lambda_handler(_event("/initialize", api_key=API_KEY), Mock())
+    
+    assert response["statusCode"] == 200
+    mock_validate.assert_called_once_with(server_hosted.mcp_keys_table, API_KEY)
+
+
+@patch("mcp_server.server_hosted.validate_api_key")
+def test_function_url_request_rejects_missing_and_invalid_keys(mock_validate):
+    """Function URL requests without a valid key get the JSON-RPC 401 errors."""
+    mock_validate.return_value = None
+    
+    assert server_hosted.lambda_handler(_event("/initialize"), Mock()) is server_hosted._ERR_NO_KEY
+    assert server_hosted.lambda_handler(_event("/initialize", api_key=API_KEY), Mock()) is server_hosted._ERR_BAD_KEY
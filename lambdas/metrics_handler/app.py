@@ -4,14 +4,10 @@ Aggregates findings data to provide dashboard metrics.
 """
 import json
 import os
-import sys
 from typing import Any, Dict, List
 from collections import defaultdict
 from decimal import Decimal
 
-# Add common to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from common.ddb import query_all_findings
 from common.logging import get_logger
 
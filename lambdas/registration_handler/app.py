@@ -10,6 +10,7 @@ import os
 import boto3
 import re
 from typing import Dict, Any, Optional
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 from datetime import datetime
 
@@ -23,10 +24,36 @@ from common.logging import get_logger
 logger = get_logger(__name__)
 
 # Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
+_DDB = boto3.client('dynamodb')
 sts_client = boto3.client('sts')
 cloudformation_client = boto3.client('cloudformation')
 
+# Resolved once per container rather than on every invocation
+_TABLE_NAME = os.environ.get('CUSTOMERS_TABLE')
+
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'POST, OPTIONS'
+}
+
+_MISSING_BODY_ERROR = "Request body is required"
+_INVALID_JSON_ERROR = "Invalid JSON in request body"
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def _to_attribute_values(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize a plain dict into DynamoDB AttributeValue format."""
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def _from_attribute_values(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Deserialize a DynamoDB AttributeValue map into a plain dict."""
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
 
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -41,16 +68,20 @@ def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'POST, OPTIONS'
-        },
+        'headers': _CORS_HEADERS,
         'body': json.dumps(body)
     }
 
 
+# Responses whose bodies never change are serialized once at import time
+_NOT_FOUND_RESPONSE = create_response(404, {'error': 'Not found'})
+_CONFIG_ERROR_RESPONSE = create_response(500, {'error': 'Internal server error'})
+_BAD_REQUEST_RESPONSES = {
+    message: create_response(400, {'error': message})
+    for message in (_MISSING_BODY_ERROR, _INVALID_JSON_ERROR)
+}
+
+
 def parse_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     Parse and extract request body from API Gateway event.
@@ -66,12 +97,12 @@ def parse_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
     """
     body = event.get('body')
     if not body:
-        raise ValueError("Request body is required")
+        raise ValueError(_MISSING_BODY_ERROR)
     
     try:
         return json.loads(body)
     except json.JSONDecodeError:
-        raise ValueError("Invalid JSON in request body")
+        raise ValueError(_INVALID_JSON_ERROR)
 
 
 def check_duplicate_tenant(table_name: str, tenant_id: str) -> bool:
@@ -85,10 +116,13 @@ def check_duplicate_tenant(table_name: str, tenant_id: str) -> bool:
     Returns:
         True if tenant_id exists, False otherwise
     """
-    table = dynamodb.Table(table_name)
-    
     try:
-        response = table.get_item(Key={'tenant_id': tenant_id})
+        # Only the key is needed to test existence
+        response = _DDB.get_item(
+            TableName=table_name,
+            Key={'tenant_id': {'S': tenant_id}},
+            ProjectionExpression='tenant_id'
+        )
         return 'Item' in response
     except ClientError as e:
         logger.error(f"Error checking for duplicate tenant_id: {e}")
@@ -229,10 +263,11 @@ def register_customer(table_name: str, customer: Customer) -> None:
     Raises:
         ClientError: If DynamoDB operation fails
     """
-    table = dynamodb.Table(table_name)
-    
     try:
-        table.put_item(Item=customer.to_dict())
+        _DDB.put_item(
+            TableName=table_name,
+            Item=_to_attribute_values(customer.to_dict())
+        )
         logger.info(f"Successfully registered customer: {customer.tenant_id}")
     except ClientError as e:
         logger.error(f"Error writing customer to DynamoDB: {e}")
@@ -250,13 +285,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         API Gateway response with status code and body
     """
-    # Get table name from environment
-    table_name = os.environ.get('CUSTOMERS_TABLE')
+    table_name = _TABLE_NAME
     if not table_name:
         logger.error("CUSTOMERS_TABLE environment variable not set")
-        return create_response(500, {
-            'error': 'Internal server error'
-        })
+        return _CONFIG_ERROR_RESPONSE
     
     # Get the path from the event
     path = event.get('path', event.get('rawPath', ''))
@@ -270,9 +302,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     elif path.endswith('/register') and http_method == 'POST':
         return handle_register(event, table_name)
     else:
-        return create_response(404, {
-            'error': 'Not found'
-        })
+        return _NOT_FOUND_RESPONSE
 
 
 def handle_register(event: Dict[str, Any], table_name: str) -> Dict[str, Any]:
@@ -294,7 +324,7 @@ def handle_register(event: Dict[str, Any], table_name: str) -> Dict[str, Any]:
             data = parse_request_body(event)
         except ValueError as e:
             logger.warning(f"Invalid request: {str(e)}")
-            return create_response(400, {'error': str(e)})
+            return _BAD_REQUEST_RESPONSES[str(e)]
         
         # Extract required fields
         tenant_id = data.get('tenant_id', '').strip()
@@ -384,7 +414,7 @@ def handle_verify_and_register(event: Dict[str, Any], table_name: str) -> Dict[s
             data = parse_request_body(event)
         except ValueError as e:
             logger.warning(f"Invalid request: {str(e)}")
-            return create_response(400, {'error': str(e)})
+            return _BAD_REQUEST_RESPONSES[str(e)]
         
         # Extract fields
         account_id = data.get('account_id', '').strip()
@@ -410,14 +440,14 @@ def handle_verify_and_register(event: Dict[str, Any], table_name: str) -> Dict[s
         expected_role_arn = f"arn:aws:iam::{account_id}:role/CloudGoldenGuardAuditRole"
         
         # Check if already registered
-        table = dynamodb.Table(table_name)
         existing_customer = None
+        key = {'tenant_id': {'S': tenant_id}}
         
         if check_duplicate_tenant(table_name, tenant_id):
             logger.info(f"Customer already registered: {tenant_id}, checking if regions need updating")
-            response = table.get_item(Key={'tenant_id': tenant_id})
+            response = _DDB.get_item(TableName=table_name, Key=key)
             if 'Item' in response:
-                existing_customer = response['Item']
+                existing_customer = _from_attribute_values(response['Item'])
                 existing_regions = set(existing_customer.get('regions', []))
                 new_regions = set(regions)
                 
@@ -428,20 +458,21 @@ def handle_verify_and_register(event: Dict[str, Any], table_name: str) -> Dict[s
                     
                     # Update the customer record with merged regions
                     now = datetime.utcnow().isoformat() + "Z"
-                    table.update_item(
-                        Key={'tenant_id': tenant_id},
+                    _DDB.update_item(
+                        TableName=table_name,
+                        Key=key,
                         UpdateExpression='SET regions = :regions, updated_at = :updated_at',
-                        ExpressionAttributeValues={
+                        ExpressionAttributeValues=_to_attribute_values({
                             ':regions': merged_regions,
                             ':updated_at': now
-                        }
+                        })
                     )
                     
                     logger.info(f"Updated regions for customer {tenant_id}: {merged_regions}")
                     
                     # Fetch updated record
-                    response = table.get_item(Key={'tenant_id': tenant_id})
-                    existing_customer = response['Item']
+                    response = _DDB.get_item(TableName=table_name, Key=key)
+                    existing_customer = _from_attribute_values(response['Item'])
                 
                 return create_response(200, {
                     'message': 'Customer already registered' if new_regions.issubset(existing_regions) else 'Customer updated with new regions',
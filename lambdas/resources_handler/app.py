@@ -2,20 +2,21 @@
 Resource inventory query handler Lambda function.
 Provides API to query scanned resources with compliance and drift information from DynamoDB.
 """
-import json
+import base64
+import gzip
 import os
-import sys
+from collections import Counter
 from typing import Any, Dict
 from decimal import Decimal
 
-# Add common to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import orjson
 
 from common.resource_inventory import (
     get_resources_by_snapshot,
     get_resources_by_compliance,
     get_resources_by_type,
-    convert_dynamodb_to_dict
+    count_snapshot_resources,
+    convert_and_tally
 )
 from common.logging import get_logger
 
@@ -25,14 +26,44 @@ logger = get_logger(__name__)
 RESOURCES_TABLE = os.environ.get('RESOURCES_TABLE', '')
 SNAPSHOTS_BUCKET = os.environ.get("SNAPSHOTS_BUCKET", "")  # Keep for backward compatibility
 
+# Shared by every response; never mutated
+_JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+}
+_GZIP_JSON_HEADERS = {**_JSON_HEADERS, 'Content-Encoding': 'gzip'}
+
 
 def decimal_default(obj):
     """JSON serializer for Decimal objects."""
-    if isinstance(obj, Decimal):
+    if type(obj) is Decimal:
+        # Integral values serialize as ints. A non-negative exponent proves
+        # that without Decimal arithmetic; values like Decimal('3.0') still
+        # need the modulo check
+        exponent = obj.as_tuple().exponent
+        if (type(exponent) is int and exponent >= 0) or obj % 1 == 0:
+            return int(obj)
         return float(obj)
     raise TypeError
 
 
+def _encode(obj: Any) -> bytes:
+    """Serialize a response body to UTF-8 JSON bytes with orjson."""
+    return orjson.dumps(obj, default=decimal_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a response body with orjson."""
+    return _encode(obj).decode()
+
+
+def _accepts_gzip(event: Dict[str, Any]) -> bool:
+    """Check whether the client advertised gzip in Accept-Encoding."""
+    headers = event.get('headers') or {}
+    accept_encoding = headers.get('accept-encoding') or headers.get('Accept-Encoding') or ''
+    return 'gzip' in accept_encoding
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Query resource inventory from DynamoDB.
@@ -43,6 +74,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     - compliance_status (optional) - filter by COMPLIANT, NON_COMPLIANT, NOT_EVALUATED
     - resource_type (optional) - filter by AWS resource type
     - limit (optional, default 100)
+    - totals_only (optional) - "true" to return only the snapshot's counts,
+      without resources; requires snapshot_key
     
     Returns:
     {
@@ -62,24 +95,44 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not tenant_id:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'tenant_id required'})
+                'headers': _JSON_HEADERS,
+                'body': _dumps({'error': 'tenant_id required'})
             }
         
         if not RESOURCES_TABLE:
             return {
                 'statusCode': 500,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({'error': 'Resources table not configured'})
+                'headers': _JSON_HEADERS,
+                'body': _dumps({'error': 'Resources table not configured'})
             }
         
         snapshot_key = params.get('snapshot_key')
+        
+        if params.get('totals_only') == 'true':
+            # Inventory items accumulate across scans, so totals are only
+            # meaningful for a single snapshot
+            if not snapshot_key:
+                return {
+                    'statusCode': 400,
+                    'headers': _JSON_HEADERS,
+                    'body': _dumps({'error': 'snapshot_key required with totals_only'})
+                }
+            
+            logger.info(f"Counting resources for tenant {tenant_id} in snapshot {snapshot_key}")
+            by_type, by_compliance = count_snapshot_resources(RESOURCES_TABLE, tenant_id, snapshot_key)
+            return {
+                'statusCode': 200,
+                'headers': _JSON_HEADERS,
+                'body': _dumps({
+                    'tenant_id': tenant_id,
+                    'totals': {
+                        'total_resources': sum(by_compliance.values()),
+                        'by_type': dict(by_type),
+                        'by_compliance': dict(by_compliance),
+                    }
+                })
+            }
+        
         compliance_status = params.get('compliance_status')
         resource_type = params.get('resource_type')
         limit = int(params.get('limit', 100))
@@ -97,31 +150,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         else:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                },
-                'body': json.dumps({
+                'headers': _JSON_HEADERS,
+                'body': _dumps({
                     'error': 'One of snapshot_key, compliance_status, or resource_type required'
                 })
             }
         
-        # Convert DynamoDB format to clean dict
-        resources = convert_dynamodb_to_dict(items)
+        # Convert DynamoDB format to clean dict and tally totals in one pass
+        by_type, by_compliance = Counter(), Counter()
+        resources = list(convert_and_tally(items, by_type, by_compliance))
         
-        # Calculate totals
         totals = {
             'total_resources': len(resources),
-            'by_type': {},
-            'by_compliance': {},
+            'by_type': dict(by_type),
+            'by_compliance': dict(by_compliance),
         }
         
-        for r in resources:
-            rtype = r.get('resource_type', 'unknown')
-            status = r.get('compliance_status', 'unknown')
-            totals['by_type'][rtype] = totals['by_type'].get(rtype, 0) + 1
-            totals['by_compliance'][status] = totals['by_compliance'].get(status, 0) + 1
-        
         response_body = {
             'tenant_id': tenant_id,
             'resources': resources,
@@ -130,32 +174,26 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         logger.info(f"Retrieved {len(resources)} resources for tenant {tenant_id}")
         
+        # Resource lists are highly repetitive JSON; level 1 keeps CPU cost low
+        if _accepts_gzip(event):
+            compressed = gzip.compress(_encode(response_body), compresslevel=1)
+            return {
+                'statusCode': 200,
+                'headers': _GZIP_JSON_HEADERS,
+                'body': base64.b64encode(compressed).decode(),
+                'isBase64Encoded': True
+            }
+        
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps(response_body, default=decimal_default)
+            'headers': _JSON_HEADERS,
+            'body': _dumps(response_body)
         }
         
     except Exception as e:
         logger.error(f"Error in resources handler: {e}", exc_info=True)
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-            },
-            'body': json.dumps({'error': str(e)})
-        }
-    except Exception as e:
-        logger.error(f"Error in resources handler: {e}", exc_info=True)
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-            },
-            "body": json.dumps({"error": str(e)}),
+            'headers': _JSON_HEADERS,
+            'body': _dumps({'error': str(e)})
         }
@@ -0,0 +1,128 @@
+"""
+Tests for resources handler.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+import json
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from common import resource_inventory
+from resources_handler.app import decimal_default, _dumps, lambda_handler
+
+TABLE_NAME = "test-resources"
+
+
+@pytest.fixture
+def resources_table():
+    """Create a mocked inventory table holding two snapshots."""
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-west-1")
+        table = dynamodb.create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        items = [
+            ("snap-1", "arn:1", "AWS::S3::Bucket", "COMPLIANT"),
+            ("snap-1", "arn:2", "AWS::S3::Bucket", "NON_COMPLIANT"),
+            ("snap-1", "arn:3", "AWS::Lambda::Function", "NOT_EVALUATED"),
+            ("snap-2", "arn:1", "AWS::S3::Bucket", "COMPLIANT"),
+        ]
+        for snapshot_key, arn, resource_type, status in items:
+            table.put_item(Item={
+                "PK": f"tenant-1#{snapshot_key}",
+                "SK": arn,
+                "resource_arn": arn,
+                "resource_type": resource_type,
+                "compliance_status": status,
+            })
+        
+        resource_inventory._table.cache_clear()
+        with patch.object(resource_inventory, "_dynamodb", dynamodb), \
+                patch("resources_handler.app.RESOURCES_TABLE", TABLE_NAME):
+            yield table
+        resource_inventory._table.cache_clear()
+
+
+def _event(**params):
+    """Build an API Gateway event with the given query parameters."""
+    return {"queryStringParameters": {"tenant_id": "tenant-1", **params}}
+
+
+def test_decimal_default_integral_values_serialize_as_int():
+    """Integral Decimals serialize as ints regardless of their exponent."""
+    assert decimal_default(Decimal("3")) == 3
+    assert type(decimal_default(Decimal("3"))) is int
+    assert decimal_default(Decimal("3.0")) == 3
+    assert type(decimal_default(Decimal("3.0"))) is int
+    assert decimal_default(Decimal("3E+2")) == 300
+
+
+def test_decimal_default_fractional_values_serialize_as_float():
+    """Fractional Decimals serialize as floats."""
+    assert decimal_default(Decimal("2.5")) == 2.5
+    assert type(decimal_default(Decimal("2.5"))) is float
+
+
+def test_dumps_decimal_output():
+    """Pin the JSON emitted for drift scores and counters."""
+    body = _dumps({"drift_score": Decimal("0.25"), "count": Decimal("3.0"), "total": Decimal("12")})
+    
+    assert body == '{"drift_score":0.25,"count":3,"total":12}'
+
+
+def test_totals_only_counts_single_snapshot(resources_table):
+    """Totals cover only the requested snapshot, including unlisted types."""
+    response = lambda_handler(_event(snapshot_key="snap-1", totals_only="true"), Mock())
+    
+    assert response["statusCode"] == 200
+    totals = json.loads(response["body"])["totals"]
+    assert totals == {
+        "total_resources": 3,
+        "by_type": {"AWS::S3::Bucket": 2, "AWS::Lambda::Function": 1},
+        "by_compliance": {"COMPLIANT": 1, "NON_COMPLIANT": 1, "NOT_EVALUATED": 1},
+    }
+
+
+def test_totals_only_matches_full_response(resources_table):
+    """totals_only agrees with the totals of the full snapshot query."""
+    counted = lambda_handler(_event(snapshot_key="snap-1", totals_only="true"), Mock())
+    full = lambda_handler(_event(snapshot_key="snap-1"), Mock())
+    
+    assert json.loads(counted["body"])["totals"] == json.loads(full["body"])["totals"]
+
+
+def test_totals_only_requires_snapshot_key(resources_table):
+    """totals_only without a snapshot is rejected rather than counting history."""
+    response = lambda_handler(_event(totals_only="true"), Mock())
+    
+    assert response["statusCode"] == 400
+    assert "snapshot_key" in response["body"]
+
+
+@patch("resources_handler.app.count_snapshot_resources")
+def test_totals_only_surfaces_dynamodb_errors(mock_count, resources_table):
+    """A failed count returns 500 instead of zero totals."""
+    mock_count.side_effect = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "throttled"}},
+        "Query",
+    )
+    
+    response = lambda_handler(_event(snapshot_key="snap-1", totals_only="true"), Mock())
+    
+    assert response["statusCode"] == 500
@@ -2,24 +2,22 @@
 Scan handler Lambda function.
 Assumes role, collects resources, evaluates against rules, stores findings.
 """
-import json
+import logging
 import os
 import boto3
-import sys
+import orjson
+import time
 import uuid
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Any, Dict
 
-# Add common to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-from common.aws import assume_role, get_enabled_regions
+from common.aws import CLIENT_CONFIG, assume_role, get_enabled_regions
 from common.normalize import collect_resources
 from common.s3io import write_snapshot
 from common.eval import evaluate_resources
 from common.ddb import put_findings
-from common.resource_inventory import put_resources
 from common.logging import get_logger, log_context
 
 logger = get_logger(__name__)
@@ -39,8 +37,8 @@ FINDINGS_TABLE = os.environ.get("FINDINGS_TABLE", "")
 RESOURCES_TABLE = os.environ.get("RESOURCES_TABLE", "")
 SNS_TOPIC_ARN = os.environ.get("ALERTS_TOPIC_ARN", "")
 ALERT_CONFIGS_TABLE = os.environ.get("ALERT_CONFIGS_TABLE", "")
-sns_client = boto3.client("sns")
-dynamodb = boto3.resource('dynamodb')
+sns_client = boto3.client("sns", config=CLIENT_CONFIG)
+dynamodb = boto3.resource('dynamodb', config=CLIENT_CONFIG)
 
 def load_alert_config():
     """
@@ -87,34 +85,30 @@ def load_alert_config():
         }
 
 
-def should_alert(finding, alert_config):
+def get_alert_severities(alert_config):
     """
-    Check if a finding should trigger an alert based on configuration.
+    Get the set of severities that should trigger an alert.
     
     Args:
-        finding: Finding dict with severity field
         alert_config: Alert configuration dict
         
     Returns:
-        bool: True if alert should be sent
+        set: Upper-cased severity levels, empty if alerting is disabled
     """
     if not alert_config.get('enabled', True):
-        return False
-    
-    severity = str(finding.get('severity', '')).upper()
-    severity_levels = [s.upper() for s in alert_config.get('severity_levels', [])]
+        return set()
     
-    return severity in severity_levels
+    return {str(s).upper() for s in alert_config.get('severity_levels', [])}
+
+# SNS PublishBatch accepts at most 10 entries per request
+SNS_BATCH_SIZE = 10
+
 
-def publish_critical_alert(finding):
+def build_alert_entry(entry_id, finding):
     """
-    Publish a simple message when a high-severity finding is detected.
+    Build a PublishBatch entry for a high-severity finding.
     `finding` is expected to be a dict with keys like tenant_id, rule_id, severity, details, etc.
     """
-    if not SNS_TOPIC_ARN:
-        # Topic not configured; silently skip to avoid breaking scans
-        return
-
     subject = f"[{finding.get('severity', 'ALERT').upper()}] Finding: {finding.get('rule_id', 'unknown')}"
     message = {
         "tenant_id": finding.get("tenant_id"),
@@ -125,15 +119,35 @@ def publish_critical_alert(finding):
     }
 
     # SNS email subject must be <= 100 chars; body is plaintext, so json-dump
-    try:
-        sns_client.publish(
-            TopicArn=SNS_TOPIC_ARN,
-            Subject=subject[:100],
-            Message=json.dumps(message, default=str)
-        )
-    except Exception as e:
-        # Don't fail the whole scan on alert errors; just log
-        print(f"SNS publish failed: {e}")
+    return {
+        "Id": str(entry_id),
+        "Subject": subject[:100],
+        "Message": orjson.dumps(message, default=str).decode(),
+    }
+
+
+def publish_critical_alerts(findings):
+    """
+    Publish one message per high-severity finding, batched into PublishBatch calls.
+    `findings` is a list of finding dicts.
+    """
+    if not SNS_TOPIC_ARN:
+        # Topic not configured; silently skip to avoid breaking scans
+        return
+
+    entries = [build_alert_entry(i, fd) for i, fd in enumerate(findings)]
+
+    for i in range(0, len(entries), SNS_BATCH_SIZE):
+        try:
+            response = sns_client.publish_batch(
+                TopicArn=SNS_TOPIC_ARN,
+                PublishBatchRequestEntries=entries[i:i + SNS_BATCH_SIZE]
+            )
+            for failed in response.get("Failed", []):
+                print(f"SNS publish failed for entry {failed.get('Id')}: {failed.get('Message')}")
+        except Exception as e:
+            # Don't fail the whole scan on alert errors; just log
+            print(f"SNS publish failed: {e}")
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -159,17 +173,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "findings": 12
         },
         "findings_sample": [...],
-        "snapshot_key": "tenants/customer-123/snapshots/20240101-120000/resources.json"
+        "snapshot_key": "tenants/customer-123/snapshots/20240101-120000/resources.json.gz"
     }
     """
     try:
-        # Log the incoming event for debugging
-        logger.info(f"Received event: {json.dumps(event)}")
+        # Log the incoming event for debugging; only serialize it when it will be emitted
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received event: %s", orjson.dumps(event, default=str).decode())
         
         # Parse input
         body = event.get("body")
         if isinstance(body, str):
-            body = json.loads(body)
+            body = orjson.loads(body)
         else:
             body = event
         
@@ -180,12 +195,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         rules_source = body.get("rules_source", "repo")
         
         # Validate required fields
-        if not all([tenant_id, role_arn, account_id]):
+        if not tenant_id or not role_arn or not account_id:
             return {
                 "statusCode": 400,
-                "body": json.dumps({
+                "body": orjson.dumps({
                     "error": "Missing required fields: tenant_id, role_arn, account_id"
-                }),
+                }).decode(),
             }
         
         log_context(
@@ -218,11 +233,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
         
         # Step 3: Write snapshot to S3
-        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        timestamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
         snapshot_key = write_snapshot(
             SNAPSHOTS_BUCKET,
             tenant_id,
-            [r.to_dict() for r in resources],
+            (r.to_dict() for r in resources),
             timestamp,
         )
         
@@ -251,33 +266,54 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             findings_count=len(findings),
         )
         
-        # Step 5: Write resources to inventory table
-        if RESOURCES_TABLE:
-            logger.info(f"Writing {len(evaluated_resources)} resources to inventory")
-            put_resources(RESOURCES_TABLE, evaluated_resources)
+        # Materialize each finding once; shared by the DynamoDB write,
+        # alerting and the response sample
+        finding_dicts = [f.to_dict() for f in findings]
         
-        # Step 6: Write findings to DynamoDB and send alerts
-        if findings:
-            put_findings(FINDINGS_TABLE, findings)
+        # Steps 5 and 6 write to different tables, so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            writes = []
+            
+            # Step 5: Write resources to inventory table
+            if RESOURCES_TABLE:
+                # Imported here so deployments without an inventory table
+                # skip building its DynamoDB resource on cold start
+                from common.resource_inventory import put_resources
+                
+                logger.info(f"Writing {len(evaluated_resources)} resources to inventory")
+                writes.append(executor.submit(put_resources, RESOURCES_TABLE, evaluated_resources))
             
+            # Step 6: Write findings to DynamoDB
+            if findings:
+                writes.append(executor.submit(put_findings, FINDINGS_TABLE, finding_dicts))
+            
+            for write in writes:
+                write.result()
+        
+        # Send alerts once findings are stored
+        if findings:
             # Load alert configuration
             alert_config = load_alert_config()
             logger.info(f"Alert config loaded: enabled={alert_config.get('enabled')}, "
                        f"severity_levels={alert_config.get('severity_levels')}")
             
             # Send alerts for matching findings
-            for f in findings:
-                fd = f.to_dict() if hasattr(f, "to_dict") else f
-                if should_alert(fd, alert_config):
-                    publish_critical_alert(fd)
-                    logger.info(f"Alert sent for finding: {fd.get('rule_id')} (severity: {fd.get('severity')})")
+            alert_severities = get_alert_severities(alert_config)
+            alerts = [
+                fd for f, fd in zip(findings, finding_dicts)
+                if f.severity.upper() in alert_severities
+            ]
+            for fd in alerts:
+                logger.info(f"Alert queued for finding: {fd.get('rule_id')} (severity: {fd.get('severity')})")
+            publish_critical_alerts(alerts)
         
         # Calculate compliance statistics
+        status_counts = Counter(r.compliance_status for r in evaluated_resources)
         compliance_stats = {
             'total': len(evaluated_resources),
-            'compliant': sum(1 for r in evaluated_resources if r.compliance_status == 'COMPLIANT'),
-            'non_compliant': sum(1 for r in evaluated_resources if r.compliance_status == 'NON_COMPLIANT'),
-            'not_evaluated': sum(1 for r in evaluated_resources if r.compliance_status == 'NOT_EVALUATED'),
+            'compliant': status_counts['COMPLIANT'],
+            'non_compliant': status_counts['NON_COMPLIANT'],
+            'not_evaluated': status_counts['NOT_EVALUATED'],
         }
         compliance_stats['compliance_percentage'] = (
             (compliance_stats['compliant'] / compliance_stats['total'] * 100) 
@@ -285,7 +321,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         )
         
         # Prepare response
-        findings_sample = [f.to_dict() for f in findings[:10]]
+        findings_sample = finding_dicts[:10]
         
         response_body = {
             "tenant_id": tenant_id,
@@ -316,7 +352,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps(response_body, default=decimal_default),
+            "body": orjson.dumps(response_body, default=decimal_default).decode(),
         }
         
     except Exception as e:
@@ -327,5 +363,5 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "Content-Type": "application/json",
                 "Access-Control-Allow-Origin": "*",
             },
-            "body": json.dumps({"error": str(e)}),
+            "body": orjson.dumps({"error": str(e)}).decode(),
         }
@@ -0,0 +1,550 @@
+"""
+Thanos MCP tool definitions and handlers.
+
+Shared by the stdio server (server.py) and the HTTP server (server_hosted.py)
+so both register the same tools and share one API client.
+"""
+import fastjsonschema
+import heapq
+import logging
+import orjson
+from collections import defaultdict
+from typing import Sequence
+
+from mcp.types import Tool, TextContent, EmbeddedResource, ImageContent
+
+# Handle both module and script imports
+try:
+    from .client import ThanosAPIClient
+except ImportError:
+    # Loaded as a top-level module; the script's directory is on sys.path
+    from client import ThanosAPIClient
+
+logger = logging.getLogger(__name__)
+
+# Display order for severity sections
+_SEVERITY_ORDER = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+# Marker per compliance status; anything else renders as "not evaluated"
+_STATUS_EMOJI = {'COMPLIANT': '✅', 'NON_COMPLIANT': '❌'}
+
+# Initialize API client (will be created on first use)
+client: ThanosAPIClient = None
+
+
+def get_client() -> ThanosAPIClient:
+    """Get or create API client instance."""
+    global client
+    if client is None:
+        try:
+            client = ThanosAPIClient()
+        except ValueError as e:
+            logger.error(f"Failed to initialize API client: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error initializing API client: {e}", exc_info=True)
+            raise
+    return client
+
+
+async def aclose_client() -> None:
+    """Close the API client, if one was created."""
+    global client
+    if client is not None:
+        await client.aclose()
+        client = None
+
+
+# JSON Schemas for each tool's arguments. Kept as plain dicts so validators
+# are compiled from them directly, independent of the Tool model's fields.
+# Tools whose handlers pass arguments straight through as client keyword
+# arguments disallow additional properties so unknown keys fail validation
+_TOOL_SCHEMAS = {
+    "list_resources": {
+        "type": "object",
+        "properties": {
+            "tenant_id": {
+                "type": "string",
+                "description": "Customer/tenant identifier (required)"
+            },
+            "compliance_status": {
+                "type": "string",
+                "enum": ["COMPLIANT", "NON_COMPLIANT", "NOT_EVALUATED"],
+                "description": "Filter by compliance status"
+            },
+            "resource_type": {
+                "type": "string",
+                "description": "Filter by AWS resource type (e.g., AWS::S3::Bucket, AWS::IAM::Policy)"
+            },
+            "snapshot_key": {
+                "type": "string",
+                "description": "Filter by specific snapshot/scan"
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of results to return (default: 100)",
+                "default": 100
+            }
+        },
+        "required": ["tenant_id"],
+        "additionalProperties": False
+    },
+    "get_findings": {
+        "type": "object",
+        "properties": {
+            "tenant_id": {
+                "type": "string",
+                "description": "Customer/tenant identifier (required)"
+            },
+            "severity": {
+                "type": "string",
+                "enum": ["CRITICAL", "HIGH", "MEDIUM", "LOW"],
+                "description": "Filter by severity level"
+            },
+            "resource_type": {
+                "type": "string",
+                "description": "Filter by AWS resource type"
+            },
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Maximum number of results (default: 50)",
+                "default": 50
+            },
+            "cursor": {
+                "type": "string",
+                "description": "Pagination cursor for next page"
+            }
+        },
+        "required": ["tenant_id"],
+        "additionalProperties": False
+    },
+    "get_dashboard_metrics": {
+        "type": "object",
+        "properties": {
+            "tenant_id": {
+                "type": "string",
+                "description": "Customer/tenant identifier (required)"
+            }
+        },
+        "required": ["tenant_id"],
+        "additionalProperties": False
+    },
+    "trigger_scan": {
+        "type": "object",
+        "properties": {
+            "tenant_id": {
+                "type": "string",
+                "description": "Customer/tenant identifier (required)"
+            },
+            "role_arn": {
+                "type": "string",
+                "description": "AWS IAM role ARN to assume for scanning (required)"
+            },
+            "account_id": {
+                "type": "string",
+                "description": "AWS account ID to scan (required)"
+            },
+            "regions": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "List of AWS regions to scan (default: ['us-east-1'])"
+            }
+        },
+        "required": ["tenant_id", "role_arn", "account_id"],
+        "additionalProperties": False
+    },
+    "list_customers": {
+        "type": "object",
+        "properties": {}
+    },
+    "get_rules": {
+        "type": "object",
+        "properties": {
+            "tenant_id": {
+                "type": "string",
+                "description": "Optional: Filter to show only custom rules for this tenant"
+            }
+        }
+    },
+    "search_violations": {
+        "type": "object",
+        "properties": {
+            "tenant_id": {
+                "type": "string",
+                "description": "Customer/tenant identifier (required)"
+            },
+            "search_term": {
+                "type": "string",
+                "description": "Term to search for in finding messages (e.g., 'public access', 'wildcard', 'SSH')"
+            },
+            "severity": {
+                "type": "string",
+                "enum": ["CRITICAL", "HIGH", "MEDIUM", "LOW"],
+                "description": "Filter by severity"
+            }
+        },
+        "required": ["tenant_id", "search_term"]
+    }
+}
+
+# Tool definitions are static, so they are built once at import
+_TOOLS = [
+    Tool(
+        name="list_resources",
+        description="Query AWS resources with compliance status, drift scores, and findings counts. Returns resources filtered by tenant, compliance status, resource type, or snapshot.",
+        inputSchema=_TOOL_SCHEMAS["list_resources"]
+    ),
+    Tool(
+        name="get_findings",
+        description="Get security compliance findings and violations. Returns detailed findings with severity, observed vs expected values, and resource information.",
+        inputSchema=_TOOL_SCHEMAS["get_findings"]
+    ),
+    Tool(
+        name="get_dashboard_metrics",
+        description="Get comprehensive dashboard metrics including current scan summary, comparison with previous scan, top violated rules, and timeline of findings.",
+        inputSchema=_TOOL_SCHEMAS["get_dashboard_metrics"]
+    ),
+    Tool(
+        name="trigger_scan",
+        description="Initiate a new compliance scan for a customer's AWS account. This will scan resources across specified regions and evaluate them against security rules.",
+        inputSchema=_TOOL_SCHEMAS["trigger_scan"]
+    ),
+    Tool(
+        name="list_customers",
+        description="List all registered customers/tenants being monitored for compliance.",
+        inputSchema=_TOOL_SCHEMAS["list_customers"]
+    ),
+    Tool(
+        name="get_rules",
+        description="Get compliance rules and security checks. Can filter to show only custom tenant-specific rules or all rules including defaults.",
+        inputSchema=_TOOL_SCHEMAS["get_rules"]
+    ),
+    Tool(
+        name="search_violations",
+        description="Search for specific security violations across all findings. Useful for finding specific misconfigurations like public S3 buckets, overly permissive IAM policies, or open security groups.",
+        inputSchema=_TOOL_SCHEMAS["search_violations"]
+    )
+]
+
+
+async def list_tools() -> list[Tool]:
+    """Define available MCP tools for Thanos compliance monitoring."""
+    return _TOOLS
+
+
+async def _handle_list_resources(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the list_resources tool and format the result as markdown."""
+    result = await api_client.alist_resources(**arguments)
+    
+    resources = result.get('resources', [])
+    totals = result.get('totals', {})
+    
+    # Build formatted response
+    lines = [
+        f"# Resources for {arguments['tenant_id']}",
+        f"",
+        f"**Total Resources:** {totals.get('total_resources', 0)}",
+        f""
+    ]
+    
+    # Compliance breakdown
+    compliance_totals = totals.get('by_compliance', {})
+    if compliance_totals:
+        lines.append("## Compliance Status")
+        for status, count in compliance_totals.items():
+            lines.append(f"- **{status}:** {count}")
+        lines.append("")
+    
+    # Type breakdown
+    type_totals = totals.get('by_type', {})
+    if type_totals:
+        lines.append("## By Resource Type")
+        for rtype, count in heapq.nlargest(10, type_totals.items(), key=lambda x: x[1]):
+            lines.append(f"- {rtype}: {count}")
+        lines.append("")
+    
+    # Top resources by drift
+    if resources:
+        lines.append("## Resources with Highest Drift")
+        sorted_resources = heapq.nlargest(15, resources, key=lambda x: x.get('drift_score', 0))
+    
+        for r in sorted_resources:
+            drift = r.get('drift_score', 0)
+            status = r.get('compliance_status', 'UNKNOWN')
+            findings = r.get('findings_count', 0)
+    
+            emoji = _STATUS_EMOJI.get(status, '⚪')
+    
+            # One formatted block per record; the trailing newline
+            # becomes the blank separator line after the join
+            lines.append(
+                f"### {emoji} {r.get('resource_type', 'Unknown')}\n"
+                f"**ARN:** `{r.get('arn', 'N/A')}`\n"
+                f"**Status:** {status} | **Drift Score:** {drift:.2f} | **Findings:** {findings}\n"
+                f"**Region:** {r.get('region', 'N/A')}\n"
+            )
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+async def _handle_get_findings(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the get_findings tool and format the result as markdown."""
+    result = await api_client.aget_findings(**arguments)
+    findings = result.get('items', [])
+    
+    lines = [
+        f"# Security Findings for {arguments['tenant_id']}",
+        f"",
+        f"**Total Findings:** {len(findings)}",
+        f""
+    ]
+    
+    # Group by severity
+    by_severity = defaultdict(list)
+    for f in findings:
+        by_severity[f.get('severity', 'UNKNOWN')].append(f)
+    
+    for severity in _SEVERITY_ORDER:
+        findings_list = by_severity.get(severity, [])
+        if findings_list:
+            lines.append(f"## {severity} ({len(findings_list)})")
+    
+            for f in findings_list[:20]:  # Limit to 20 per severity
+                region_line = f"**Region:** {f['region']}\n" if f.get('region') else ""
+                lines.append(
+                    f"### {f.get('message', 'No message')}\n"
+                    f"**Resource:** `{f.get('resource_arn', 'N/A')}`\n"
+                    f"**Type:** {f.get('resource_type', 'N/A')}\n"
+                    f"**Expected:** `{orjson.dumps(f.get('expected', 'N/A')).decode()}`\n"
+                    f"**Observed:** `{orjson.dumps(f.get('observed', 'N/A')).decode()}`\n"
+                    f"{region_line}"
+                )
+    
+    if result.get('next_cursor'):
+        lines.append(f"---")
+        lines.append(f"**More results available.** Use cursor: `{result['next_cursor']}`")
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+async def _handle_get_dashboard_metrics(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the get_dashboard_metrics tool and format the result as markdown."""
+    result = await api_client.aget_dashboard_metrics(**arguments)
+    
+    lines = [
+        f"# Dashboard Metrics for {arguments['tenant_id']}",
+        f""
+    ]
+    
+    # Current scan
+    current = result.get('current_scan', {})
+    if current:
+        lines.append("## Current Scan")
+        lines.append(f"- **Resources Scanned:** {current.get('total_resources', 0)}")
+        lines.append(f"- **Findings:** {current.get('total_findings', 0)}")
+        lines.append(f"- **Compliance Rate:** {current.get('compliance_percentage', 0):.1f}%")
+    
+        by_severity = current.get('by_severity', {})
+        if by_severity:
+            lines.append(f"- **By Severity:**")
+            for sev in _SEVERITY_ORDER:
+                if sev in by_severity:
+                    lines.append(f"  - {sev}: {by_severity[sev]}")
+        lines.append("")
+    
+    # Previous scan comparison
+    previous = result.get('previous_scan')
+    if previous:
+        lines.append("## Comparison with Previous Scan")
+        current_findings = current.get('total_findings', 0)
+        prev_findings = previous.get('total_findings', 0)
+        delta = current_findings - prev_findings
+    
+        trend = "📈" if delta > 0 else "📉" if delta < 0 else "➡️"
+        lines.append(f"{trend} **Change in Findings:** {delta:+d}")
+        lines.append("")
+    
+    # Top violated rules
+    top_rules = result.get('top_rules', [])
+    if top_rules:
+        lines.append("## Most Violated Rules")
+        for rule in top_rules[:10]:
+            lines.append(f"- **{rule.get('message', 'Unknown')}** ({rule.get('severity', 'N/A')}): {rule.get('count', 0)} violations")
+        lines.append("")
+    
+    # Timeline
+    timeline = result.get('timeline', [])
+    if timeline:
+        lines.append("## Findings Timeline")
+        for point in timeline[-10:]:  # Last 10 data points
+            lines.append(f"- {point.get('date', 'N/A')}: {point.get('count', 0)} findings")
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+async def _handle_trigger_scan(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the trigger_scan tool and format the result as markdown."""
+    result = await api_client.atrigger_scan(**arguments)
+    
+    lines = [
+        f"# Scan Initiated",
+        f"",
+        f"**Scan ID:** `{result.get('scan_id', 'N/A')}`",
+        f"**Tenant:** {result.get('tenant_id', 'N/A')}",
+        f"**Account:** {result.get('account_id', 'N/A')}",
+        f"**Regions:** {', '.join(result.get('regions', []))}",
+        f"",
+        f"## Results",
+        f"- **Resources Scanned:** {result.get('totals', {}).get('resources', 0)}",
+        f"- **Findings Detected:** {result.get('totals', {}).get('findings', 0)}",
+        f""
+    ]
+    
+    compliance = result.get('compliance', {})
+    if compliance:
+        lines.append(f"## Compliance Summary")
+        lines.append(f"- **Total Resources:** {compliance.get('total', 0)}")
+        lines.append(f"- **Compliant:** {compliance.get('compliant', 0)}")
+        lines.append(f"- **Non-Compliant:** {compliance.get('non_compliant', 0)}")
+        lines.append(f"- **Compliance Rate:** {compliance.get('compliance_percentage', 0):.1f}%")
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+async def _handle_list_customers(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the list_customers tool and format the result as markdown."""
+    customers = await api_client.aget_customers()
+    
+    lines = [
+        f"# Registered Customers",
+        f"",
+        f"**Total:** {len(customers)}",
+        f""
+    ]
+    
+    for customer in customers:
+        lines.append(
+            f"## {customer.get('customer_name', 'Unknown')}\n"
+            f"- **Tenant ID:** `{customer.get('tenant_id', 'N/A')}`\n"
+            f"- **Account ID:** {customer.get('account_id', 'N/A')}\n"
+            f"- **Role ARN:** `{customer.get('role_arn', 'N/A')}`\n"
+            f"- **Regions:** {', '.join(customer.get('regions', []))}\n"
+            f"- **Status:** {customer.get('status', 'unknown')}\n"
+        )
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+async def _handle_get_rules(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the get_rules tool and format the result as markdown."""
+    result = await api_client.aget_rules(arguments.get('tenant_id'))
+    rules = result.get('rules', [])
+    
+    lines = [
+        f"# Compliance Rules",
+        f"",
+        f"**Total Rules:** {len(rules)}",
+        f""
+    ]
+    
+    # Group by resource type
+    by_type = defaultdict(list)
+    for rule in rules:
+        by_type[rule.get('resource_type', 'Unknown')].append(rule)
+    
+    for rtype, type_rules in sorted(by_type.items()):
+        lines.append(f"## {rtype} ({len(type_rules)} rules)")
+    
+        for rule in type_rules:
+            source = rule.get('source', 'unknown')
+            severity = rule.get('severity', 'N/A')
+            enabled = rule.get('enabled', True)
+            status = "✓" if enabled else "✗"
+    
+            lines.append(
+                f"- {status} **[{severity}]** {rule.get('message', 'No description')}\n"
+                f"  - ID: `{rule.get('id', 'N/A')}` | Source: {source}"
+            )
+    
+        lines.append("")
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+async def _handle_search_violations(api_client: ThanosAPIClient, arguments: dict) -> list[TextContent]:
+    """Run the search_violations tool and format the result as markdown."""
+    # Get all findings and filter by search term
+    result = await api_client.aget_findings(
+        tenant_id=arguments['tenant_id'],
+        severity=arguments.get('severity'),
+        limit=200  # Get more for searching
+    )
+    
+    findings = result.get('items', [])
+    needle = arguments['search_term'].lower()
+    
+    # Filter findings by search term in message (null messages never match)
+    matched = [f for f in findings if needle in (f.get('message') or '').lower()]
+    
+    lines = [
+        f"# Search Results: '{arguments['search_term']}'",
+        f"",
+        f"**Matched Findings:** {len(matched)} (searched {len(findings)} total)",
+        f""
+    ]
+    
+    for f in matched[:30]:  # Limit to 30 results
+        lines.append(
+            f"## {f.get('message', 'No message')}\n"
+            f"- **Severity:** {f.get('severity', 'N/A')}\n"
+            f"- **Resource:** `{f.get('resource_arn', 'N/A')}`\n"
+            f"- **Type:** {f.get('resource_type', 'N/A')}\n"
+            f"- **Expected:** `{orjson.dumps(f.get('expected', 'N/A')).decode()}`\n"
+            f"- **Observed:** `{orjson.dumps(f.get('observed', 'N/A')).decode()}`\n"
+        )
+    
+    return [TextContent(type="text", text="\n".join(lines))]
+
+
+# Tool name -> handler
+_TOOL_HANDLERS = {
+    "list_resources": _handle_list_resources,
+    "get_findings": _handle_get_findings,
+    "get_dashboard_metrics": _handle_get_dashboard_metrics,
+    "trigger_scan": _handle_trigger_scan,
+    "list_customers": _handle_list_customers,
+    "get_rules": _handle_get_rules,
+    "search_violations": _handle_search_violations,
+}
+
+# Argument validators generated once from each tool's schema; they also
+# fill in schema defaults
+_VALIDATORS = {name: fastjsonschema.compile(schema) for name, schema in _TOOL_SCHEMAS.items()}
+
+
+async def call_tool(name: str, arguments: dict) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Execute MCP tool calls."""
+    
+    try:
+        handler = _TOOL_HANDLERS.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown tool: {name}")
+        
+        # Reject malformed arguments before doing any work
+        try:
+            _VALIDATORS[name](arguments)
+        except fastjsonschema.JsonSchemaException as e:
+            return [TextContent(type="text", text=f"Invalid arguments: {e.message}")]
+        
+        # Lazy initialization - only create client when first tool is called
+        # This allows server to start even if env vars are missing initially
+        api_client = get_client()
+        
+        return await handler(api_client, arguments)
+    
+    except Exception as e:
+        logger.error(f"Error executing tool {name}: {e}", exc_info=True)
+        error_msg = f"Error: {str(e)}\n\nPlease check:\n- Environment variables are set correctly\n- API endpoint is accessible\n- Credentials are valid"
+        return [TextContent(type="text", text=error_msg)]
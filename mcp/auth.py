@@ -3,14 +3,183 @@ Cognito authentication manager for Thanos MCP server.
 Handles token lifecycle, automatic refresh, and credential management.
 """
 import boto3
+import functools
+import heapq
+import itertools
+import json
 import os
-from typing import Optional
+import pathlib
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 import logging
+from botocore.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Background refresh runs this long before Cognito's own expiry, ahead of
+# the 5 minute margin used by authenticate(), so callers never wait on it
+BACKGROUND_REFRESH_LEAD_SECONDS = 600
+
+# Keep-alive stops idle NATs/load balancers from dropping the connection
+# between the auth and refresh calls, which are spaced minutes apart
+_COGNITO_CONFIG = Config(
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    max_pool_connections=10
+)
+
+# Opt-in: when THANOS_PERSIST_TOKENS is set, tokens are persisted here so
+# short-lived processes can skip the password flow
+_PERSIST_TOKENS = os.environ.get('THANOS_PERSIST_TOKENS', '').lower() in ('1', 'true', 'yes')
+_TOKEN_CACHE = pathlib.Path(
+    os.environ.get('XDG_CACHE_HOME', '~/.cache')
+).expanduser() / 'thanos' / 'tokens.json'
+
+# cognito-idp clients by region, shared by every CognitoAuthManager
+_cognito_clients: Dict[str, Any] = {}
+_cognito_clients_lock = threading.Lock()
+
+
+def _get_cognito_client(region: str) -> Any:
+    """
+    Return the shared cognito-idp client for a region, creating it on first use.
+    
+    Args:
+        region: AWS region of the user pool
+    
+    Returns:
+        boto3 cognito-idp client
+    """
+    with _cognito_clients_lock:
+        client = _cognito_clients.get(region)
+        if client is None:
+            # Own session: the default boto3 session is not thread-safe
+            client = boto3.session.Session().client(
+                'cognito-idp', region_name=region, config=_COGNITO_CONFIG
+            )
+            _cognito_clients[region] = client
+        return client
+
+
+# Background refreshes for every manager run from one daemon thread that
+# sleeps until the earliest deadline on a heap of (deadline, id, callback)
+_refresh_heap: List[Tuple[float, int, Callable[[], None]]] = []
+_refresh_cancelled: Set[int] = set()
+_refresh_condition = threading.Condition()
+_refresh_ids = itertools.count()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _schedule(delay: float, callback: Callable[[], None]) -> int:
+    """
+    Run a callback on the shared refresh thread after a delay.
+    
+    Args:
+        delay: Seconds to wait
+        callback: Function to run; it must not block for long
+    
+    Returns:
+        int: Handle for _cancel()
+    """
+    global _refresh_thread
+    with _refresh_condition:
+        handle = next(_refresh_ids)
+        heapq.heappush(_refresh_heap, (time.monotonic() + delay, handle, callback))
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(
+                target=_run_scheduled, name='thanos-token-refresh', daemon=True
+            )
+            _refresh_thread.start()
+        _refresh_condition.notify()
+        return handle
+
+
+def _cancel(handle: int) -> None:
+    """Cancel a callback scheduled with _schedule(), if it has not run yet."""
+    with _refresh_condition:
+        if any(entry[1] == handle for entry in _refresh_heap):
+            _refresh_cancelled.add(handle)
+
+
+def _run_scheduled() -> None:
+    """Scheduler loop: pop due callbacks and run them outside the lock."""
+    while True:
+        with _refresh_condition:
+            while True:
+                if not _refresh_heap:
+                    _refresh_condition.wait()
+                    continue
+                delay = _refresh_heap[0][0] - time.monotonic()
+                if delay > 0:
+                    _refresh_condition.wait(delay)
+                    continue
+                _, handle, callback = heapq.heappop(_refresh_heap)
+                if handle in _refresh_cancelled:
+                    _refresh_cancelled.discard(handle)
+                    continue
+                break
+        try:
+            callback()
+        except Exception as e:
+            logger.warning(f"Scheduled token refresh raised: {e}")
+
+
+@dataclass(frozen=True, slots=True)
+class _AuthConfig:
+    """Cognito settings read from the environment."""
+    user_pool_id: str
+    client_id: str
+    email: str
+    password: str
+    region: str
+
+
+@functools.lru_cache(maxsize=1)
+def _load_auth_config() -> _AuthConfig:
+    """
+    Read and validate the Cognito environment variables once per process.
+    
+    Failures are not cached, so a later call can succeed once the
+    variables are set.
+    
+    Returns:
+        _AuthConfig: Validated settings
+    
+    Raises:
+        ValueError: If a variable is missing or the pool ID is malformed
+    """
+    required_vars = ['THANOS_USER_POOL_ID', 'THANOS_CLIENT_ID', 'THANOS_EMAIL', 'THANOS_PASSWORD']
+    missing_vars = [var for var in required_vars if var not in os.environ]
+    if missing_vars:
+        raise ValueError(
+            f"Missing required environment variables: {', '.join(missing_vars)}\n"
+            "Please set these in your Claude Desktop config or environment."
+        )
+    
+    user_pool_id = os.environ['THANOS_USER_POOL_ID']
+    
+    # Extract region from user pool ID (format: us-east-1_XXXXX)
+    try:
+        region = user_pool_id.split('_')[0]
+    except (IndexError, AttributeError):
+        raise ValueError(
+            f"Invalid THANOS_USER_POOL_ID format: {user_pool_id}\n"
+            "Expected format: us-east-1_XXXXXXXXX"
+        )
+    
+    return _AuthConfig(
+        user_pool_id=user_pool_id,
+        client_id=os.environ['THANOS_CLIENT_ID'],
+        email=os.environ['THANOS_EMAIL'],
+        password=os.environ['THANOS_PASSWORD'],
+        region=region
+    )
+
 
 @dataclass
 class TokenSet:
@@ -18,7 +187,7 @@ class TokenSet:
     id_token: str
     access_token: str
     refresh_token: str
-    expires_at: datetime
+    expires_at: float  # time.monotonic() deadline
 
 
 class CognitoAuthManager:
@@ -30,34 +199,24 @@ class CognitoAuthManager:
     - THANOS_CLIENT_ID: Cognito App Client ID
     - THANOS_EMAIL: Service account email
     - THANOS_PASSWORD: Service account password
+    
+    Optional:
+    - THANOS_PERSIST_TOKENS: Set to 1 to cache tokens on disk between runs
     """
     
     def __init__(self):
-        # Validate required environment variables
-        required_vars = ['THANOS_USER_POOL_ID', 'THANOS_CLIENT_ID', 'THANOS_EMAIL', 'THANOS_PASSWORD']
-        missing_vars = [var for var in required_vars if var not in os.environ]
-        if missing_vars:
-            raise ValueError(
-                f"Missing required environment variables: {', '.join(missing_vars)}\n"
-                "Please set these in your Claude Desktop config or environment."
-            )
-        
-        self.user_pool_id = os.environ['THANOS_USER_POOL_ID']
-        self.client_id = os.environ['THANOS_CLIENT_ID']
-        self.email = os.environ['THANOS_EMAIL']
-        self.password = os.environ['THANOS_PASSWORD']
-        
-        # Extract region from user pool ID (format: us-east-1_XXXXX)
-        try:
-            self.region = self.user_pool_id.split('_')[0]
-        except (IndexError, AttributeError):
-            raise ValueError(
-                f"Invalid THANOS_USER_POOL_ID format: {self.user_pool_id}\n"
-                "Expected format: us-east-1_XXXXXXXXX"
-            )
+        config = _load_auth_config()
+        self.user_pool_id = config.user_pool_id
+        self.client_id = config.client_id
+        self.email = config.email
+        self.password = config.password
+        self.region = config.region
         
-        self.cognito = boto3.client('cognito-idp', region_name=self.region)
+        self.cognito = _get_cognito_client(self.region)
         self.tokens: Optional[TokenSet] = None
+        self._lock = threading.Lock()
+        self._refresh_handle: Optional[int] = None
+        self._load_cached_tokens()
         
         logger.info(f"Initialized CognitoAuthManager for pool {self.user_pool_id}")
     
@@ -69,22 +228,130 @@ class CognitoAuthManager:
         Returns:
             str: Valid Cognito ID token
         """
-        # Check if we have valid cached tokens
-        if self.tokens and datetime.now() < self.tokens.expires_at:
+        # Fast path without the lock; the TokenSet reference is read once
+        tokens = self.tokens
+        if tokens and time.monotonic() < tokens.expires_at:
             logger.debug("Using cached token")
-            return self.tokens.id_token
+            return tokens.id_token
         
-        # Try to refresh if we have a refresh token
-        if self.tokens and self.tokens.refresh_token:
+        # Only one thread refreshes; the others block here and then pick up
+        # the token it obtained from the re-check below
+        with self._lock:
+            if self.tokens and time.monotonic() < self.tokens.expires_at:
+                logger.debug("Using token refreshed by another thread")
+                return self.tokens.id_token
+            
+            # Try to refresh if we have a refresh token
+            if self.tokens and self.tokens.refresh_token:
+                try:
+                    logger.info("Refreshing expired token")
+                    return self._refresh_tokens()
+                except Exception as e:
+                    logger.warning(f"Token refresh failed: {e}, re-authenticating")
+            
+            # Perform initial authentication
+            logger.info("Performing initial authentication")
+            return self._initial_auth()
+    
+    def stop(self) -> None:
+        """Cancel the pending background refresh, if any."""
+        if self._refresh_handle is not None:
+            _cancel(self._refresh_handle)
+            self._refresh_handle = None
+    
+    def _load_cached_tokens(self) -> None:
+        """
+        Restore tokens persisted by a previous process for the same user.
+        
+        Still-valid tokens are used as-is; expired ones are kept for their
+        refresh token so authenticate() refreshes instead of re-entering
+        the password flow.
+        """
+        if not _PERSIST_TOKENS:
+            return
+        
+        try:
+            cached = json.loads(_TOKEN_CACHE.read_bytes())
+        except (OSError, ValueError):
+            return
+        
+        if (cached.get('user_pool_id'), cached.get('client_id'), cached.get('email')) != (
+            self.user_pool_id, self.client_id, self.email
+        ):
+            return
+        
+        try:
+            remaining = cached['expires_at_epoch'] - time.time()
+            self.tokens = TokenSet(
+                id_token=cached['id_token'],
+                access_token=cached['access_token'],
+                refresh_token=cached['refresh_token'],
+                expires_at=time.monotonic() + remaining
+            )
+        except (KeyError, TypeError):
+            return
+        
+        if remaining > 0:
+            # expires_at carries the 5 minute margin; add it back for Cognito's expiry
+            self._schedule_refresh(int(remaining) + 300)
+        logger.info("Loaded cached tokens")
+    
+    def _save_tokens(self) -> None:
+        """Persist the current tokens, readable only by the owning user."""
+        tokens = self.tokens
+        if not _PERSIST_TOKENS or tokens is None:
+            return
+        
+        payload = {
+            'user_pool_id': self.user_pool_id,
+            'client_id': self.client_id,
+            'email': self.email,
+            'id_token': tokens.id_token,
+            'access_token': tokens.access_token,
+            'refresh_token': tokens.refresh_token,
+            # Monotonic time does not survive a restart, so store wall-clock
+            'expires_at_epoch': time.time() + tokens.expires_at - time.monotonic(),
+        }
+        
+        tmp_path = None
+        try:
+            _TOKEN_CACHE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # A unique temp file per write, so concurrent processes never
+            # share one; mkstemp creates it with 0600 permissions
+            with tempfile.NamedTemporaryFile(
+                'w', dir=_TOKEN_CACHE.parent, prefix='tokens.', suffix='.tmp', delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(payload, f)
+            os.replace(tmp_path, _TOKEN_CACHE)
+        except OSError as e:
+            logger.warning(f"Could not persist tokens: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    def _schedule_refresh(self, expires_in: int) -> None:
+        """
+        Schedule a background token refresh ahead of expiry.
+        
+        Args:
+            expires_in: Token lifetime in seconds as reported by Cognito
+        """
+        self.stop()
+        delay = max(expires_in - BACKGROUND_REFRESH_LEAD_SECONDS, 60)
+        self._refresh_handle = _schedule(delay, self._background_refresh)
+    
+    def _background_refresh(self) -> None:
+        """Refresh tokens off the request path; failures fall back to authenticate()."""
+        with self._lock:
+            if not self.tokens:
+                return
             try:
-                logger.info("Refreshing expired token")
-                return self._refresh_tokens()
+                self._refresh_tokens()
             except Exception as e:
-                logger.warning(f"Token refresh failed: {e}, re-authenticating")
-        
-        # Perform initial authentication
-        logger.info("Performing initial authentication")
-        return self._initial_auth()
+                logger.warning(f"Background token refresh failed: {e}")
     
     def _initial_auth(self) -> str:
         """
@@ -111,11 +378,12 @@ class CognitoAuthManager:
                 id_token=auth_result['IdToken'],
                 access_token=auth_result['AccessToken'],
                 refresh_token=auth_result['RefreshToken'],
-                expires_at=datetime.now() + timedelta(
-                    seconds=auth_result['ExpiresIn'] - 300
-                )
+                expires_at=time.monotonic() + auth_result['ExpiresIn'] - 300
             )
             
+            self._schedule_refresh(auth_result['ExpiresIn'])
+            self._save_tokens()
+            
             logger.info("Successfully authenticated")
             return self.tokens.id_token
             
@@ -144,13 +412,18 @@ class CognitoAuthManager:
             
             auth_result = response['AuthenticationResult']
             
-            # Update tokens (refresh token remains the same)
-            self.tokens.id_token = auth_result['IdToken']
-            self.tokens.access_token = auth_result['AccessToken']
-            self.tokens.expires_at = datetime.now() + timedelta(
-                seconds=auth_result['ExpiresIn'] - 300
+            # Swap in a new TokenSet (refresh token remains the same) so
+            # lock-free readers never see a half-updated one
+            self.tokens = TokenSet(
+                id_token=auth_result['IdToken'],
+                access_token=auth_result['AccessToken'],
+                refresh_token=self.tokens.refresh_token,
+                expires_at=time.monotonic() + auth_result['ExpiresIn'] - 300
             )
             
+            self._schedule_refresh(auth_result['ExpiresIn'])
+            self._save_tokens()
+            
             logger.info("Successfully refreshed tokens")
             return self.tokens.id_token
             
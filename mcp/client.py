@@ -1,23 +1,76 @@
 """
 API client for Thanos backend with automatic Cognito authentication.
 """
+import asyncio
+import functools
+import orjson
 import requests
 import os
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Handle both module and script imports
 try:
     from .auth import CognitoAuthManager
 except ImportError:
-    # When running as a script, use absolute imports
-    import sys
-    import os
-    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # Loaded as a top-level module (server.py run as a script); the
+    # script's directory is already first on sys.path
     from auth import CognitoAuthManager
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (5, 30)
+
+# Threads used by gather(); kept below the adapter's pool_maxsize so every
+# worker gets its own pooled connection
+MAX_PARALLEL_REQUESTS = 8
+
+# Transient gateway errors and throttling are retried with exponential
+# backoff. urllib3's default allowed_methods are kept, so POSTs (scans,
+# registrations) are never replayed.
+_RETRY_POLICY = Retry(
+    total=5,
+    backoff_factor=0.25,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True
+)
+
+# Every API path the client calls; full URLs are built once per client
+_ENDPOINTS = (
+    '/resources',
+    '/findings',
+    '/findings/metrics',
+    '/scan',
+    '/customers',
+    '/customers/register',
+    '/config/rules',
+    '/config/base',
+    '/config/groups',
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_api_url() -> str:
+    """
+    Read and validate THANOS_API_URL once per process.
+    
+    Returns:
+        str: Base URL for the Thanos API
+    
+    Raises:
+        ValueError: If the variable is missing (not cached, so it can be set later)
+    """
+    if 'THANOS_API_URL' not in os.environ:
+        raise ValueError(
+            "Missing required environment variables: THANOS_API_URL\n"
+            "Please set these in your Claude Desktop config or environment."
+        )
+    return os.environ['THANOS_API_URL']
+
 
 class ThanosAPIClient:
     """
@@ -29,19 +82,59 @@ class ThanosAPIClient:
     """
     
     def __init__(self):
-        # Validate required environment variables
-        required_vars = ['THANOS_API_URL']
-        missing_vars = [var for var in required_vars if var not in os.environ]
-        if missing_vars:
-            raise ValueError(
-                f"Missing required environment variables: {', '.join(missing_vars)}\n"
-                "Please set these in your Claude Desktop config or environment."
-            )
-        
-        self.api_url = os.environ['THANOS_API_URL']
+        self.api_url = _load_api_url()
+        self._urls = {endpoint: self.api_url + endpoint for endpoint in _ENDPOINTS}
         self.auth_manager = CognitoAuthManager()
+        
+        # Persistent session keeps the TLS connection to API Gateway warm
+        # between calls instead of handshaking on every request
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=_RETRY_POLICY
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'Content-Type': 'application/json'})
+        self._cached_token: Optional[str] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=MAX_PARALLEL_REQUESTS, thread_name_prefix='thanos-api'
+        )
+        
         logger.info(f"Initialized ThanosAPIClient for {self.api_url}")
     
+    def close(self) -> None:
+        """Release pooled connections and stop background token refresh."""
+        self.auth_manager.stop()
+        self._executor.shutdown(wait=False)
+        self._session.close()
+    
+    def __enter__(self) -> 'ThanosAPIClient':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def gather(self, *calls: Callable[[], Any]) -> List[Any]:
+        """
+        Run independent API calls concurrently.
+        
+        Example:
+            metrics, findings = client.gather(
+                lambda: client.get_dashboard_metrics(tenant_id),
+                lambda: client.get_findings(tenant_id),
+            )
+        
+        Args:
+            calls: Zero-argument callables, typically lambdas around client methods
+        
+        Returns:
+            list: Results in the same order as calls; the first failure is re-raised
+        """
+        futures = [self._executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+    
     def _make_request(
         self, 
         method: str, 
@@ -67,28 +160,31 @@ class ThanosAPIClient:
         # Get valid token (handles refresh automatically)
         token = self.auth_manager.authenticate()
         
-        headers = {
-            'Authorization': token,
-            'Content-Type': 'application/json'
-        }
+        # Only touch the session headers when the token rotates; a racing
+        # thread can at worst install another currently valid token
+        if token is not self._cached_token:
+            self._session.headers['Authorization'] = token
+            self._cached_token = token
         
-        url = f"{self.api_url}{endpoint}"
+        url = self._urls.get(endpoint) or self.api_url + endpoint
         
         logger.debug(f"{method} {endpoint}")
         
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=headers,
                 params=params,
-                json=json_data,
-                timeout=30
+                data=orjson.dumps(json_data) if json_data is not None else None,
+                timeout=REQUEST_TIMEOUT
             )
             
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
             
+        except requests.exceptions.RetryError as e:
+            logger.error(f"API still failing after retries: {method} {endpoint}: {e}")
+            raise
         except requests.HTTPError as e:
             logger.error(f"API error: {e.response.status_code} - {e.response.text}")
             raise
@@ -151,7 +247,7 @@ class ThanosAPIClient:
             resource_type: Filter by AWS resource type
         
         Returns:
-            dict: Response with findings array and optional next_cursor
+            dict: Response with items array and optional next_cursor
         """
         params = {'tenant_id': tenant_id, 'limit': limit}
         
@@ -164,6 +260,43 @@ class ThanosAPIClient:
         
         return self._make_request('GET', '/findings', params=params)
     
+    def iter_findings(
+        self,
+        tenant_id: str,
+        page_size: int = 50,
+        severity: Optional[str] = None,
+        resource_type: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all findings, fetching pages only as they are consumed.
+        
+        Stopping iteration early skips the remaining requests, and only one
+        page is held in memory at a time.
+        
+        Args:
+            tenant_id: Customer identifier
+            page_size: Findings requested per page
+            severity: Filter by CRITICAL, HIGH, MEDIUM, or LOW
+            resource_type: Filter by AWS resource type
+        
+        Yields:
+            dict: One finding at a time
+        """
+        cursor = None
+        while True:
+            page = self.get_findings(
+                tenant_id,
+                limit=page_size,
+                cursor=cursor,
+                severity=severity,
+                resource_type=resource_type
+            )
+            yield from page.get('items', [])
+            
+            cursor = page.get('next_cursor')
+            if not cursor:
+                return
+    
     def get_dashboard_metrics(self, tenant_id: str) -> Dict[str, Any]:
         """
         Get dashboard metrics including scan history and top violations.
@@ -299,3 +432,47 @@ class ThanosAPIClient:
             params['tenant_id'] = tenant_id
         
         return self._make_request('GET', '/config/groups', params=params)
+    
+    # Async API: each coroutine runs its blocking counterpart in a worker
+    # thread, so concurrent tool calls share the pooled session and token
+    # cache without blocking the event loop
+    
+    async def aclose(self) -> None:
+        """Async variant of close()."""
+        await asyncio.to_thread(self.close)
+    
+    async def alist_resources(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of list_resources()."""
+        return await asyncio.to_thread(self.list_resources, *args, **kwargs)
+    
+    async def aget_findings(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of get_findings()."""
+        return await asyncio.to_thread(self.get_findings, *args, **kwargs)
+    
+    async def aget_dashboard_metrics(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of get_dashboard_metrics()."""
+        return await asyncio.to_thread(self.get_dashboard_metrics, *args, **kwargs)
+    
+    async def atrigger_scan(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of trigger_scan()."""
+        return await asyncio.to_thread(self.trigger_scan, *args, **kwargs)
+    
+    async def aget_customers(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        """Async variant of get_customers()."""
+        return await asyncio.to_thread(self.get_customers, *args, **kwargs)
+    
+    async def aregister_customer(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of register_customer()."""
+        return await asyncio.to_thread(self.register_customer, *args, **kwargs)
+    
+    async def aget_rules(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of get_rules()."""
+        return await asyncio.to_thread(self.get_rules, *args, **kwargs)
+    
+    async def aget_base_configs(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of get_base_configs()."""
+        return await asyncio.to_thread(self.get_base_configs, *args, **kwargs)
+    
+    async def aget_groups(self, *args, **kwargs) -> Dict[str, Any]:
+        """Async variant of get_groups()."""
+        return await asyncio.to_thread(self.get_groups, *args, **kwargs)
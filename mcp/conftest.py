@@ -0,0 +1,27 @@
+"""
+Test setup for the MCP server.
+
+This directory has an __init__.py, so pytest imports its tests as submodules
+of a local package named "mcp" (putting the repository root on sys.path),
+which shadows the MCP SDK. Load the SDK modules the servers use under their
+real names first, then restore the local package, so imports resolve as
+they do when the servers run as scripts.
+"""
+import importlib
+import os
+import sys
+
+_repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_saved_path = sys.path[:]
+_local_package = sys.modules.pop('mcp', None)
+try:
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != _repo_root]
+    for _module in ('mcp.types', 'mcp.server', 'mcp.server.sse', 'mcp.server.stdio'):
+        importlib.import_module(_module)
+except ImportError:
+    # SDK not installed; tests that need it fail on their own imports
+    pass
+finally:
+    sys.path[:] = _saved_path
+    if _local_package is not None:
+        sys.modules['mcp'] = _local_package
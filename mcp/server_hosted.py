@@ -4,7 +4,7 @@ Thanos MCP Server - HTTP/SSE Transport for AWS Lambda
 Hosted version that accepts remote connections via API Gateway
 """
 import asyncio
-import json
+import orjson
 import logging
 import os
 from typing import Any, Dict
@@ -14,14 +14,16 @@ from mcp.server import Server
 from mcp.types import Tool, TextContent
 import mcp.server.sse
 
-# Import the tool definitions and handlers from the original server
-import sys
-sys.path.append(os.path.dirname(__file__))
-from server import list_tools, call_tool, get_client
+# Tool definitions and handlers shared with the stdio server
+try:
+    from ._handlers import list_tools, call_tool, get_client, _TOOLS
+except ImportError:
+    # Loaded as a top-level module; the handler's directory is on sys.path
+    from _handlers import list_tools, call_tool, get_client, _TOOLS
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -33,6 +35,69 @@ app = Server("thanos-compliance")
 app.list_tools()(list_tools)
 app.call_tool()(call_tool)
 
+# tools/list always returns the same definitions; dump them once, and
+# serialize its whole result so responses only splice in the request id
+_TOOLS_RESULT_JSON = orjson.dumps({'tools': [t.model_dump() for t in _TOOLS]}).decode()
+
+# initialize is answered with the same static result every time
+_INITIALIZE_RESULT_JSON = orjson.dumps({
+    'protocolVersion': '2024-11-05',
+    'capabilities': {
+        'tools': {}
+    },
+    'serverInfo': {
+        'name': 'thanos-compliance',
+        'version': '1.0.0'
+    }
+}).decode()
+
+# Only tools/call needs the event loop; everything else is answered inline
+_INLINE_RESULTS = {
+    'tools/list': _TOOLS_RESULT_JSON,
+    'initialize': _INITIALIZE_RESULT_JSON,
+}
+
+# One event loop for the life of the container; asyncio.run() would build
+# and tear down a loop (and its default thread pool) on every request
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
+# Response headers and error responses are identical on every request, so
+# they are built once; the Lambda runtime only reads the returned dicts
+_JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+_SSE_HEADERS = {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'Access-Control-Allow-Origin': '*'
+}
+_ERR_NO_KEY = {
+    'statusCode': 401,
+    'headers': _JSON_HEADERS,
+    'body': orjson.dumps({'error': 'Missing API key'}).decode()
+}
+_ERR_BAD_KEY = {
+    'statusCode': 401,
+    'headers': _JSON_HEADERS,
+    'body': orjson.dumps({'error': 'Invalid API key'}).decode()
+}
+_ERR_NOT_FOUND = {
+    'statusCode': 404,
+    'headers': _JSON_HEADERS,
+    'body': orjson.dumps({'error': 'Not found'}).decode()
+}
+
+# Create the API client (and its pooled session) during the init phase so
+# warm invocations of this container all reuse the same connections.
+# Missing configuration is reported again on the first tool call.
+try:
+    get_client()
+except Exception as e:
+    logger.warning(f"API client not initialized at startup: {e}")
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -44,27 +109,21 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     3. MCP protocol message routing
     """
     
-    logger.info(f"Received event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Received event: {orjson.dumps(event, default=str).decode()}")
     
-    # Validate API key
-    headers = event.get('headers', {})
-    api_key = headers.get('x-api-key') or headers.get('X-Api-Key')
-    
-    if not api_key:
-        return {
-            'statusCode': 401,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': 'Missing API key'})
-        }
-    
-    # Validate key against DynamoDB (simplified - should call mcp_keys handler)
-    # For now, just check format
-    if not api_key.startswith('thanos_mcp_'):
-        return {
-            'statusCode': 401,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': 'Invalid API key'})
-        }
+    # Behind API Gateway the MCP authorizer has already validated the key;
+    # invoked any other way, fall back to checking it here
+    if not (event.get('requestContext', {}).get('authorizer') or {}).get('lambda'):
+        headers = event.get('headers', {})
+        api_key = headers.get('x-api-key') or headers.get('X-Api-Key')
+        
+        if not api_key:
+            return _ERR_NO_KEY
+        
+        # Format check only; the authorizer does the DynamoDB lookup
+        if not api_key.startswith('thanos_mcp_'):
+            return _ERR_BAD_KEY
     
     try:
         # Handle SSE connection
@@ -74,12 +133,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             # SSE endpoint - establish connection
             return {
                 'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'text/event-stream',
-                    'Cache-Control': 'no-cache',
-                    'Connection': 'keep-alive',
-                    'Access-Control-Allow-Origin': '*'
-                },
+                'headers': _SSE_HEADERS,
                 'body': handle_sse_connection(event)
             }
         
@@ -88,31 +142,28 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return handle_mcp_message(event)
         
         else:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'error': 'Not found'})
-            }
+            return _ERR_NOT_FOUND
     
     except Exception as e:
         logger.error(f"Error handling request: {e}", exc_info=True)
         return {
             'statusCode': 500,
-            'headers': {'Content-Type': 'application/json'},
-            'body': json.dumps({'error': str(e)})
+            'headers': _JSON_HEADERS,
+            'body': orjson.dumps({'error': str(e)}).decode()
         }
 
 
+# A buffered Lambda response can only carry this one event; a blank line
+# terminates it so clients dispatch it instead of waiting for more data
+_SSE_CONNECTED_EVENT = (
+    'event: connected\n'
+    f'data: {orjson.dumps({"status": "connected", "server": "thanos-mcp"}).decode()}\n\n'
+)
+
+
 def handle_sse_connection(event: Dict[str, Any]) -> str:
     """Handle SSE connection establishment."""
-    
-    # Send initial connection event
-    events = []
-    events.append('event: connected')
-    events.append(f'data: {json.dumps({"status": "connected", "server": "thanos-mcp"})}')
-    events.append('')
-    
-    return '\n'.join(events)
+    return _SSE_CONNECTED_EVENT
 
 
 def handle_mcp_message(event: Dict[str, Any]) -> Dict[str, Any]:
@@ -122,95 +173,93 @@ def handle_mcp_message(event: Dict[str, Any]) -> Dict[str, Any]:
     This processes JSON-RPC style messages from MCP clients.
     """
     
+    # Bound before parsing so the error path can always read an id
+    message = {}
     try:
         body = event.get('body', '{}')
         if event.get('isBase64Encoded'):
             body = base64.b64decode(body).decode('utf-8')
         
-        message = json.loads(body)
+        parsed = orjson.loads(body)
+        if not isinstance(parsed, dict):
+            raise ValueError('JSON-RPC message must be an object')
+        message = parsed
+        method = message.get('method')
         
-        # Process MCP message
-        result = asyncio.run(process_mcp_message(message))
+        if method in _INLINE_RESULTS:
+            response_body = (
+                f'{{"jsonrpc": "2.0", "result": {_INLINE_RESULTS[method]}, '
+                f'"id": {orjson.dumps(message.get("id")).decode()}}}'
+            )
+        elif method == 'tools/call':
+            # Process MCP message
+            result = _LOOP.run_until_complete(process_mcp_message(message))
+            response_body = orjson.dumps(result).decode()
+        else:
+            response_body = orjson.dumps(_method_not_found(method, message.get('id'))).decode()
         
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps(result)
+            'headers': _JSON_HEADERS,
+            'body': response_body
         }
     
     except Exception as e:
         logger.error(f"Error processing MCP message: {e}", exc_info=True)
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
+            'headers': _JSON_HEADERS,
+            'body': orjson.dumps({
                 'jsonrpc': '2.0',
                 'error': {
                     'code': -32603,
                     'message': str(e)
                 },
                 'id': message.get('id')
-            })
+            }).decode()
         }
 
 
-async def process_mcp_message(message: Dict[str, Any]) -> Dict[str, Any]:
-    """Process an MCP JSON-RPC message."""
+def _dump_content(content: Any) -> Dict[str, Any]:
+    """
+    Convert a tool result item to its JSON-RPC dict.
     
-    method = message.get('method')
-    params = message.get('params', {})
-    msg_id = message.get('id')
+    Tool handlers only produce plain TextContent, whose shape is fixed, so
+    it is built directly instead of going through pydantic's model_dump().
+    """
+    if type(content) is TextContent and getattr(content, 'annotations', None) is None:
+        return {'type': 'text', 'text': content.text}
+    return content.model_dump()
+
+
+def _method_not_found(method: Any, msg_id: Any) -> Dict[str, Any]:
+    """Build the JSON-RPC error for an unsupported method."""
+    return {
+        'jsonrpc': '2.0',
+        'error': {
+            'code': -32601,
+            'message': f'Method not found: {method}'
+        },
+        'id': msg_id
+    }
+
+
+async def process_mcp_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process an MCP tools/call message.
     
-    if method == 'tools/list':
-        tools = await list_tools()
-        return {
-            'jsonrpc': '2.0',
-            'result': {'tools': [t.model_dump() for t in tools]},
-            'id': msg_id
-        }
+    initialize, tools/list and unknown methods are answered inline by
+    handle_mcp_message, so only tool calls reach the event loop.
+    """
     
-    elif method == 'tools/call':
-        tool_name = params.get('name')
-        arguments = params.get('arguments', {})
-        
-        result = await call_tool(tool_name, arguments)
-        
-        return {
-            'jsonrpc': '2.0',
-            'result': {
-                'content': [c.model_dump() for c in result]
-            },
-            'id': msg_id
-        }
+    params = message.get('params', {})
     
-    elif method == 'initialize':
-        return {
-            'jsonrpc': '2.0',
-            'result': {
-                'protocolVersion': '2024-11-05',
-                'capabilities': {
-                    'tools': {}
-                },
-                'serverInfo': {
-                    'name': 'thanos-compliance',
-                    'version': '1.0.0'
-                }
-            },
-            'id': msg_id
-        }
+    result = await call_tool(params.get('name'), params.get('arguments', {}))
     
-    else:
-        return {
-            'jsonrpc': '2.0',
-            'error': {
-                'code': -32601,
-                'message': f'Method not found: {method}'
-            },
-            'id': msg_id
-        }
+    return {
+        'jsonrpc': '2.0',
+        'result': {
+            'content': [_dump_content(c) for c in result]
+        },
+        'id': message.get('id')
+    }
@@ -0,0 +1,147 @@
+"""
+Tests for Cognito token persistence and the background refresh scheduler.
+"""
+import json
+import sys
+import os
+import stat
+import threading
+import time
+
+# Add the mcp directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from unittest.mock import patch
+
+import auth
+from auth import CognitoAuthManager, TokenSet
+
+
+def _manager(tokens=None):
+    """Build a CognitoAuthManager without reading the environment or AWS."""
+    manager = object.__new__(CognitoAuthManager)
+    manager.user_pool_id = 'us-east-1_test'
+    manager.client_id = 'client'
+    manager.email = 'svc@example.com'
+    manager.tokens = tokens
+    manager._lock = threading.Lock()
+    manager._refresh_handle = None
+    return manager
+
+
+def _tokens(lifetime=3600):
+    """Build a TokenSet expiring after the given number of seconds."""
+    return TokenSet(
+        id_token='id',
+        access_token='access',
+        refresh_token='refresh',
+        expires_at=time.monotonic() + lifetime
+    )
+
+
+def test_save_tokens_writes_private_file(tmp_path):
+    """Persisted tokens are readable only by the owner and leave no temp files."""
+    cache = tmp_path / 'thanos' / 'tokens.json'
+    
+    with patch.object(auth, '_PERSIST_TOKENS', True), patch.object(auth, '_TOKEN_CACHE', cache):
+        _manager(_tokens())._save_tokens()
+    
+    assert stat.S_IMODE(cache.stat().st_mode) == 0o600
+    assert json.loads(cache.read_text())['refresh_token'] == 'refresh'
+    assert [p.name for p in cache.parent.iterdir()] == ['tokens.json']
+
+
+def test_concurrent_saves_do_not_share_temp_files(tmp_path):
+    """Writers racing on the cache each replace it with a complete file."""
+    cache = tmp_path / 'thanos' / 'tokens.json'
+    errors = []
+    
+    def save(index):
+        tokens = _tokens()
+        tokens.id_token = f'id-{index}'
+        try:
+            for _ in range(20):
+                _manager(tokens)._save_tokens()
+        except Exception as e:
+            errors.append(e)
+    
+    with patch.object(auth, '_PERSIST_TOKENS', True), patch.object(auth, '_TOKEN_CACHE', cache), \
+            patch.object(auth.logger, 'warning', side_effect=AssertionError):
+        threads = [threading.Thread(target=save, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    assert errors == []
+    assert json.loads(cache.read_text())['id_token'].startswith('id-')
+    assert [p.name for p in cache.parent.iterdir()] == ['tokens.json']
+
+
+def test_load_cached_tokens_restores_matching_user(tmp_path):
+    """Tokens saved by one manager are restored by the next for the same user."""
+    cache = tmp_path / 'thanos' / 'tokens.json'
+    
+    with patch.object(auth, '_PERSIST_TOKENS', True), patch.object(auth, '_TOKEN_CACHE', cache), \
+            patch.object(CognitoAuthManager, '_schedule_refresh'):
+        _manager(_tokens())._save_tokens()
+        restored = _manager()
+        restored._load_cached_tokens()
+    
+    assert restored.tokens.refresh_token == 'refresh'
+    assert restored.tokens.expires_at > time.monotonic()
+
+
+def test_scheduler_runs_callbacks_in_deadline_order():
+    """Callbacks run on the shared thread in order of their deadlines."""
+    ran = []
+    done = threading.Event()
+    
+    auth._schedule(0.2, lambda: (ran.append('late'), done.set()))
+    auth._schedule(0.05, lambda: ran.append('early'))
+    
+    assert done.wait(5)
+    assert ran == ['early', 'late']
+
+
+def test_scheduler_skips_cancelled_callbacks():
+    """A cancelled callback never runs; later ones still do."""
+    ran = []
+    done = threading.Event()
+    
+    handle = auth._schedule(0.05, lambda: ran.append('cancelled'))
+    auth._cancel(handle)
+    auth._schedule(0.1, done.set)
+    
+    assert done.wait(5)
+    assert ran == []
+    assert handle not in auth._refresh_cancelled
+
+
+def test_scheduler_survives_failing_callback():
+    """An exception in one callback does not stop the scheduler thread."""
+    done = threading.Event()
+    
+    def fail():
+        raise RuntimeError('boom')
+    
+    auth._schedule(0.01, fail)
+    auth._schedule(0.05, done.set)
+    
+    assert done.wait(5)
+    assert auth._refresh_thread.is_alive()
+
+
+def test_schedule_refresh_replaces_pending_refresh():
+    """Rescheduling cancels the previous refresh and leads Cognito's expiry."""
+    manager = _manager(_tokens())
+    
+    with patch.object(auth, '_schedule', side_effect=[1, 2]) as mock_schedule, \
+            patch.object(auth, '_cancel') as mock_cancel:
+        manager._schedule_refresh(3600)
+        manager._schedule_refresh(30)
+    
+    delays = [call.args[0] for call in mock_schedule.call_args_list]
+    assert delays == [3600 - auth.BACKGROUND_REFRESH_LEAD_SECONDS, 60]
+    mock_cancel.assert_called_once_with(1)
+    assert manager._refresh_handle == 2
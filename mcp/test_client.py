@@ -0,0 +1,56 @@
+"""
+Tests for the Thanos API client.
+"""
+import sys
+import os
+
+# Add the mcp directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from unittest.mock import patch
+
+import client as client_module
+from client import ThanosAPIClient
+
+
+@pytest.fixture
+def api_client():
+    """Build a client against a dummy URL without authenticating."""
+    client_module._load_api_url.cache_clear()
+    with patch.dict(os.environ, {'THANOS_API_URL': 'https://api.example.com'}), \
+            patch.object(client_module, 'CognitoAuthManager'):
+        api_client = ThanosAPIClient()
+        yield api_client
+        api_client.close()
+    client_module._load_api_url.cache_clear()
+
+
+def test_iter_findings_pages_through_cursor(api_client):
+    """Findings from every page are yielded, following next_cursor."""
+    pages = [
+        {'items': [{'finding_id': '1'}, {'finding_id': '2'}], 'next_cursor': 'cursor-1'},
+        {'items': [{'finding_id': '3'}]},
+    ]
+    
+    with patch.object(api_client, '_make_request', side_effect=pages) as mock_request:
+        findings = list(api_client.iter_findings('tenant-1', page_size=2, severity='HIGH'))
+    
+    assert [f['finding_id'] for f in findings] == ['1', '2', '3']
+    first, second = (call.kwargs['params'] for call in mock_request.call_args_list)
+    assert first == {'tenant_id': 'tenant-1', 'limit': 2, 'severity': 'HIGH'}
+    assert second == {'tenant_id': 'tenant-1', 'limit': 2, 'cursor': 'cursor-1', 'severity': 'HIGH'}
+
+
+def test_iter_findings_fetches_lazily(api_client):
+    """Stopping after the first page skips the remaining requests."""
+    pages = [
+        {'items': [{'finding_id': '1'}], 'next_cursor': 'cursor-1'},
+        {'items': [{'finding_id': '2'}]},
+    ]
+    
+    with patch.object(api_client, '_make_request', side_effect=pages) as mock_request:
+        first = next(api_client.iter_findings('tenant-1'))
+    
+    assert first == {'finding_id': '1'}
+    assert mock_request.call_count == 1
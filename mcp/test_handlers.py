@@ -0,0 +1,87 @@
+"""
+Tests for MCP tool argument validation and dispatch.
+"""
+import sys
+import os
+
+# Add the mcp directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import _handlers
+from mcp.types import TextContent
+
+
+def _call(name, arguments):
+    """Run call_tool with a stubbed API client and handler."""
+    handler = AsyncMock(return_value=[TextContent(type="text", text="ok")])
+    with patch.dict(_handlers._TOOL_HANDLERS, {name: handler}), \
+            patch.object(_handlers, 'get_client', return_value=Mock()) as mock_get_client:
+        result = asyncio.run(_handlers.call_tool(name, arguments))
+    return result, handler, mock_get_client
+
+
+def test_every_tool_has_a_validator_and_handler():
+    """Each listed tool is validated against its own schema and dispatched."""
+    names = {tool.name for tool in _handlers._TOOLS}
+    
+    assert names == set(_handlers._TOOL_SCHEMAS) == set(_handlers._VALIDATORS) == set(_handlers._TOOL_HANDLERS)
+
+
+def test_call_tool_fills_schema_defaults():
+    """Validated arguments reach the handler with schema defaults filled in."""
+    result, handler, _ = _call("get_findings", {"tenant_id": "tenant-1"})
+    
+    assert result[0].text == "ok"
+    arguments = handler.await_args.args[1]
+    assert arguments == {"tenant_id": "tenant-1", "limit": 50}
+
+
+def test_call_tool_rejects_missing_required_argument():
+    """Missing required arguments are reported without creating the client."""
+    result, handler, mock_get_client = _call("trigger_scan", {"tenant_id": "tenant-1"})
+    
+    assert result[0].text.startswith("Invalid arguments:")
+    handler.assert_not_awaited()
+    mock_get_client.assert_not_called()
+
+
+def test_call_tool_rejects_invalid_enum_value():
+    """Values outside a schema enum are rejected."""
+    result, handler, _ = _call("get_findings", {"tenant_id": "tenant-1", "severity": "URGENT"})
+    
+    assert result[0].text.startswith("Invalid arguments:")
+    handler.assert_not_awaited()
+
+
+def test_call_tool_rejects_unknown_argument():
+    """Misspelled keys fail validation instead of reaching the client as kwargs."""
+    for name, arguments in [
+        ("get_findings", {"tenant_id": "tenant-1", "severty": "HIGH"}),
+        ("list_resources", {"tenant_id": "tenant-1", "status": "COMPLIANT"}),
+        ("get_dashboard_metrics", {"tenant_id": "tenant-1", "limit": 5}),
+        ("trigger_scan", {"tenant_id": "t", "role_arn": "r", "account_id": "a", "region": "us-east-1"}),
+    ]:
+        result, handler, mock_get_client = _call(name, arguments)
+        
+        assert result[0].text.startswith("Invalid arguments:")
+        handler.assert_not_awaited()
+        mock_get_client.assert_not_called()
+
+
+def test_call_tool_rejects_non_integer_limit():
+    """limit must be a positive integer."""
+    for limit in (2.5, 0, "10"):
+        result, handler, _ = _call("list_resources", {"tenant_id": "tenant-1", "limit": limit})
+        
+        assert result[0].text.startswith("Invalid arguments:")
+        handler.assert_not_awaited()
+
+
+def test_call_tool_unknown_tool():
+    """Unknown tool names return an error message."""
+    result = asyncio.run(_handlers.call_tool("no_such_tool", {}))
+    
+    assert "Unknown tool: no_such_tool" in result[0].text
@@ -0,0 +1,71 @@
+"""
+Tests for hosted MCP JSON-RPC message handling.
+"""
+import sys
+import os
+
+# Add the mcp directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import json
+from unittest.mock import AsyncMock, patch
+
+from mcp.types import TextContent
+
+import server_hosted
+
+
+def _post(message):
+    """Run a raw JSON-RPC body through handle_mcp_message."""
+    body = message if isinstance(message, str) else json.dumps(message)
+    response = server_hosted.handle_mcp_message({'body': body})
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_initialize_and_tools_list_answered_inline():
+    """initialize and tools/list return their cached results with the request id."""
+    status, body = _post({'jsonrpc': '2.0', 'method': 'initialize', 'id': 1})
+    assert status == 200
+    assert body['id'] == 1
+    assert body['result']['serverInfo']['name'] == 'thanos-compliance'
+    
+    status, body = _post({'jsonrpc': '2.0', 'method': 'tools/list', 'id': 'abc'})
+    assert status == 200
+    assert body['id'] == 'abc'
+    assert [t['name'] for t in body['result']['tools']] == [t.name for t in server_hosted._TOOLS]
+
+
+def test_tools_call_dispatches_to_handler():
+    """tools/call runs the shared call_tool and dumps its content."""
+    call_tool = AsyncMock(return_value=[TextContent(type='text', text='ok')])
+    message = {
+        'jsonrpc': '2.0',
+        'method': 'tools/call',
+        'params': {'name': 'list_findings', 'arguments': {'tenant_id': 't'}},
+        'id': 7,
+    }
+    
+    with patch.object(server_hosted, 'call_tool', call_tool):
+        status, body = _post(message)
+    
+    assert status == 200
+    assert body == {'jsonrpc': '2.0', 'result': {'content': [{'type': 'text', 'text': 'ok'}]}, 'id': 7}
+    call_tool.assert_awaited_once_with('list_findings', {'tenant_id': 't'})
+
+
+def test_unknown_method_returns_method_not_found():
+    """Unsupported methods get a -32601 error."""
+    status, body = _post({'jsonrpc': '2.0', 'method': 'resources/list', 'id': 3})
+    
+    assert status == 200
+    assert body['error']['code'] == -32601
+    assert body['id'] == 3
+
+
+def test_unparseable_body_returns_internal_error():
+    """Bodies that fail to parse produce a JSON-RPC error, not an unbound-name crash."""
+    for raw in ('{not json', '[1, 2]'):
+        status, body = _post(raw)
+        assert status == 500
+        assert body['error']['code'] == -32603
+        assert body['id'] is None